@@ -1,11 +1,11 @@
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 import asyncio
 from app.core.config import settings
 from app.core.database import Base
-from app.models import User, Trip, TripEvent, SignDetection
+from app.models import User, RevokedToken, Trip, TripEvent, SignDetection, SignDetectionRaw, SpeedCompliance, DriverDailyStats
 
 # this is the Alembic Config object
 config = context.config
@@ -44,7 +44,7 @@ def do_run_migrations(connection):
 
 async def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
-    connectable = engine_from_config(
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
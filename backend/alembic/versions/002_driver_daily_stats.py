@@ -0,0 +1,71 @@
+"""Driver daily stats for fleet analytics
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'driver_daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('trip_count', sa.Integer(), nullable=False),
+        sa.Column('distance_m', sa.Float(), nullable=False),
+        sa.Column('duration_seconds', sa.Integer(), nullable=False),
+        sa.Column('unsafe_events', sa.Integer(), nullable=False),
+        sa.Column('event_counts', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('rate_sketch', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', name='uq_driver_daily_stats_user_day')
+    )
+    op.create_index(op.f('ix_driver_daily_stats_id'), 'driver_daily_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_driver_daily_stats_day'), 'driver_daily_stats', ['day'], unique=False)
+    
+    # Backfill from existing trips; per-trip rate sketches start with new uploads
+    op.execute("""
+        INSERT INTO driver_daily_stats
+            (user_id, day, trip_count, distance_m, duration_seconds, unsafe_events, event_counts)
+        SELECT user_id, (start_time AT TIME ZONE 'UTC')::date, count(*),
+               coalesce(sum(distance_m), 0), coalesce(sum(duration_seconds), 0),
+               coalesce(sum(unsafe_events), 0), '{}'::json
+        FROM trips
+        WHERE start_time IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    op.execute("""
+        UPDATE driver_daily_stats AS s
+        SET event_counts = c.counts
+        FROM (
+            SELECT user_id, day, json_object_agg(event_type, n) AS counts
+            FROM (
+                SELECT t.user_id, (t.start_time AT TIME ZONE 'UTC')::date AS day,
+                       e.event_type, count(*) AS n
+                FROM trip_events e JOIN trips t ON t.id = e.trip_id
+                WHERE t.start_time IS NOT NULL
+                GROUP BY 1, 2, 3
+            ) AS per_type
+            GROUP BY 1, 2
+        ) AS c
+        WHERE s.user_id = c.user_id AND s.day = c.day
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_driver_daily_stats_day'), table_name='driver_daily_stats')
+    op.drop_index(op.f('ix_driver_daily_stats_id'), table_name='driver_daily_stats')
+    op.drop_table('driver_daily_stats')
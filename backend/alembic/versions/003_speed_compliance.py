@@ -0,0 +1,42 @@
+"""Per-trip speed-limit compliance
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'speed_compliance',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('trip_id', sa.Integer(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('samples_with_limit', sa.Integer(), nullable=False),
+        sa.Column('samples_over_limit', sa.Integer(), nullable=False),
+        sa.Column('time_with_limit_s', sa.Float(), nullable=False),
+        sa.Column('time_over_limit_s', sa.Float(), nullable=False),
+        sa.Column('distance_over_limit_m', sa.Float(), nullable=False),
+        sa.Column('max_excess_kmh', sa.Float(), nullable=False),
+        sa.Column('by_limit', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['trip_id'], ['trips.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('trip_id')
+    )
+    op.create_index(op.f('ix_speed_compliance_id'), 'speed_compliance', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_speed_compliance_id'), table_name='speed_compliance')
+    op.drop_table('speed_compliance')
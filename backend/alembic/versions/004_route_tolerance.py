@@ -0,0 +1,28 @@
+"""Route simplification tolerance per trip event
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('trip_events', sa.Column('route_tolerance_m', sa.Float(), nullable=True))
+    op.create_index(
+        'ix_trip_events_trip_id_route_tolerance_m', 'trip_events',
+        ['trip_id', 'route_tolerance_m'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trip_events_trip_id_route_tolerance_m', table_name='trip_events')
+    op.drop_column('trip_events', 'route_tolerance_m')
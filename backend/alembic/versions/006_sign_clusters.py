@@ -0,0 +1,46 @@
+"""Clustered sign detections and optional raw frames
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows each stand for a single detection
+    op.add_column('sign_detections', sa.Column('detection_count', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('sign_detections', sa.Column('last_ts', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('sign_detections', sa.Column('mean_confidence', sa.Float(), nullable=True))
+
+    op.create_table(
+        'sign_detections_raw',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('trip_id', sa.Integer(), nullable=False),
+        sa.Column('sign_detection_id', sa.Integer(), nullable=False),
+        sa.Column('ts', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('class_name', sa.String(), nullable=True),
+        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('bbox', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(['trip_id'], ['trips.id'], ),
+        sa.ForeignKeyConstraint(['sign_detection_id'], ['sign_detections.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sign_detections_raw_trip_id'), 'sign_detections_raw', ['trip_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sign_detections_raw_trip_id'), table_name='sign_detections_raw')
+    op.drop_table('sign_detections_raw')
+    op.drop_column('sign_detections', 'mean_confidence')
+    op.drop_column('sign_detections', 'last_ts')
+    op.drop_column('sign_detections', 'detection_count')
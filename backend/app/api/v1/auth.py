@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from jose import jwt
 from passlib.context import CryptContext
+import uuid
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User
+from app.core.dependencies import get_current_user, revocations, security, token_verifier
+from app.models.user import User, RevokedToken
 from app.schemas.user import UserCreate, UserResponse, Token, LoginRequest
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+# Pinning min and max to the configured rounds makes passlib flag any other
+# work factor as needing an update, so login rehashes in either direction
+_rounds = (
+    {f"pbkdf2_sha256__{key}": settings.PASSWORD_HASH_ROUNDS
+     for key in ("default_rounds", "min_rounds", "max_rounds")}
+    if settings.PASSWORD_HASH_ROUNDS else {}
+)
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto", **_rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,7 +39,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
@@ -63,12 +75,47 @@ async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == login_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    valid, new_hash = (
+        pwd_context.verify_and_update(login_data.password[:72], user.password_hash)
+        if user else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade hashes made with an outdated scheme or work factor
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    payload = token_verifier.verify(credentials.credentials)
+    if not payload or not payload.get("jti"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token has no id and cannot be revoked"
+        )
+    
+    expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc) if payload.get("exp") else None
+    await db.execute(
+        pg_insert(RevokedToken)
+        .values(jti=payload["jti"], user_id=current_user.id, expires_at=expires_at)
+        .on_conflict_do_nothing(index_elements=["jti"])
+    )
+    await db.commit()
+    
+    revocations.add(payload["jti"], expires_at)
+    token_verifier.forget(credentials.credentials)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
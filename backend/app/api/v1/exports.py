@@ -0,0 +1,93 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Literal, Optional
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.export import ExportJobCreate, ExportJobResponse
+from app.services import export
+
+router = APIRouter()
+jobs = export.ExportJobStore(
+    settings.EXPORT_DIR,
+    settings.EXPORT_RETENTION_HOURS * 3600,
+    settings.EXPORT_JOB_STALE_SECONDS,
+)
+
+
+@router.get("/{kind}.csv")
+async def export_csv(
+    kind: Literal["trips", "events"],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[List[str]] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    query = export.build_query(kind, current_user.id, start=start, end=end, event_types=event_type)
+    return StreamingResponse(
+        export.iter_csv(db, kind, query, settings.EXPORT_BATCH_SIZE),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="steermate-{kind}.csv"'},
+    )
+
+
+@router.post("/jobs", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    job_data: ExportJobCreate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    if job_data.format == "parquet" and not export.PARQUET_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export not available"
+        )
+    
+    job = jobs.create(current_user.id, job_data.model_dump(mode="json"))
+    background_tasks.add_task(jobs.run, job, AsyncSessionLocal, settings.EXPORT_BATCH_SIZE)
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: str = Path(..., pattern="^[0-9a-f]{32}$"),
+    current_user: User = Depends(get_current_user)
+):
+    return _get_job(job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export(
+    job_id: str = Path(..., pattern="^[0-9a-f]{32}$"),
+    current_user: User = Depends(get_current_user)
+):
+    job = _get_job(job_id, current_user)
+    
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is {job['status']}"
+        )
+    
+    media_type = "text/csv" if job["format"] == "csv" else "application/vnd.apache.parquet"
+    return FileResponse(
+        jobs.output_path(job),
+        media_type=media_type,
+        filename=f"steermate-{job['kind']}.{job['format']}",
+    )
+
+
+def _get_job(job_id: str, current_user: User) -> dict:
+    job = jobs.load(job_id)
+    
+    if job is None or job["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found"
+        )
+    
+    return job
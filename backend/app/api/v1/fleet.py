@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+from app.core.database import get_db
+from app.core.dependencies import get_operator_user
+from app.models.user import User
+from app.services import fleet
+
+router = APIRouter()
+
+
+def _since(days: int):
+    return (datetime.now(timezone.utc) - timedelta(days=days - 1)).date()
+
+
+@router.get("/leaderboard")
+async def get_leaderboard(
+    days: int = Query(30, ge=1, le=366),
+    limit: int = Query(10, ge=1, le=100),
+    order: Literal["safest", "riskiest"] = "safest",
+    min_distance_km: float = Query(10.0, ge=0),
+    current_user: User = Depends(get_operator_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return {
+        "days": days,
+        "order": order,
+        "drivers": await fleet.leaderboard(
+            db,
+            since=_since(days),
+            limit=limit,
+            riskiest=order == "riskiest",
+            min_distance_m=min_distance_km * 1000,
+        )
+    }
+
+
+@router.get("/cohort")
+async def get_cohort(
+    days: int = Query(30, ge=1, le=366),
+    current_user: User = Depends(get_operator_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await fleet.cohort(db, since=_since(days))
@@ -0,0 +1,179 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.dependencies import authenticate_token, get_current_user, is_operator
+from app.models.user import User
+from app.schemas.trip import TripEventCreate, SignDetectionCreate, LiveTripClose
+from app.services.live import LiveTripSession
+from app.services.pubsub import LiveHub, Subscription
+
+router = APIRouter()
+
+# The default backend fans out per process: publishers and subscribers only
+# meet in the same worker (gunicorn.conf.py warns when running several)
+hub = LiveHub(queue_size=settings.LIVE_SUBSCRIBER_QUEUE_SIZE)
+
+
+@router.websocket("/trips")
+async def live_trip(websocket: WebSocket):
+    user = await _websocket_user(websocket)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    
+    session = await LiveTripSession.open(
+        AsyncSessionLocal,
+        user_id=user.id,
+        batch_size=settings.LIVE_FLUSH_BATCH,
+        flush_interval=settings.LIVE_FLUSH_INTERVAL_SECONDS,
+    )
+    hub.publish(user.id, {
+        "type": "trip_started",
+        "trip_id": session.trip_id,
+        "start_time": session.start_time.isoformat(),
+    })
+    await websocket.send_json({"type": "opened", "trip_id": session.trip_id})
+    
+    summary = None
+    try:
+        while summary is None:
+            message = await _receive_json_object(websocket)
+            if message is None:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            kind = message.pop("type", None)
+            try:
+                if kind == "event":
+                    event = TripEventCreate.model_validate(message)
+                    await session.add_event(event)
+                    hub.publish(user.id, {
+                        "type": "event", "trip_id": session.trip_id, **event.model_dump(mode="json")
+                    })
+                elif kind == "sign":
+                    sign = SignDetectionCreate.model_validate(message)
+                    session.add_sign(sign)
+                    hub.publish(user.id, {
+                        "type": "sign", "trip_id": session.trip_id, **sign.model_dump(mode="json")
+                    })
+                elif kind == "end":
+                    summary = LiveTripClose.model_validate(message).model_dump()
+                else:
+                    await websocket.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "detail": json.loads(e.json(include_url=False))})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # A dropped connection still finalises the trip with what was received
+        trip = await session.close(summary)
+        hub.publish(user.id, {"type": "trip_ended", "trip_id": trip.id})
+    
+    # Only a client that sent "end" is still listening
+    if summary is not None:
+        await websocket.send_json({"type": "closed", "trip_id": trip.id})
+        await websocket.close()
+
+
+@router.get("/drivers/{user_id}/events")
+async def watch_driver_events(
+    user_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    if not _may_watch(current_user, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to watch this driver"
+        )
+    # Release the pooled connection before the long-lived stream starts
+    await db.close()
+    
+    async def stream():
+        with hub.subscribe(user_id) as subscription:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                messages = await _next_messages(subscription, settings.LIVE_KEEPALIVE_SECONDS)
+                if not messages:
+                    yield ": keepalive\n\n"
+                for message in messages:
+                    yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/drivers/{user_id}")
+async def watch_driver(websocket: WebSocket, user_id: int):
+    user = await _websocket_user(websocket)
+    if user is None or not _may_watch(user, user_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    
+    with hub.subscribe(user_id) as subscription:
+        async def forward():
+            while True:
+                for message in await _next_messages(subscription, None):
+                    await websocket.send_json(message)
+        
+        forwarder = asyncio.create_task(forward())
+        try:
+            # Incoming frames are ignored; this only waits for the disconnect
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            forwarder.cancel()
+
+
+async def _receive_json_object(websocket: WebSocket) -> Optional[Dict[str, Any]]:
+    # receive_text() fails on binary frames, so read the raw ASGI message
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+    if message.get("text") is None:
+        return None
+    try:
+        payload = json.loads(message["text"])
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _may_watch(user: User, user_id: int) -> bool:
+    # Drivers see their own trips; everyone else needs operator access
+    return user.id == user_id or is_operator(user)
+
+
+async def _websocket_user(websocket: WebSocket) -> Optional[User]:
+    token = websocket.query_params.get("token")
+    if not token:
+        scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer":
+            return None
+    if not token:
+        return None
+    async with AsyncSessionLocal() as db:
+        return await authenticate_token(token, db)
+
+
+async def _next_messages(subscription: Subscription, timeout: Optional[float]) -> List[Dict[str, Any]]:
+    try:
+        message = await asyncio.wait_for(subscription.get(), timeout)
+    except asyncio.TimeoutError:
+        return []
+    dropped = subscription.take_dropped()
+    notices = [{"type": "lagged", "dropped": dropped}] if dropped else []
+    return notices + [message]
@@ -1,36 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
-from typing import Dict, Any, List
+from sqlalchemy import Float, cast, select, func
+from typing import Dict, Any, List, Optional
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
-from app.models.trip import Trip, TripEvent, SignDetection
+from app.models.trip import Trip, TripEvent, SignDetection, SpeedCompliance
+from app.core.config import settings
+from app.services import compliance, inference
 import json
-# Optional ML imports
-try:
-    import tensorflow as tf
-    import numpy as np
-    from PIL import Image
-    ML_AVAILABLE = True
-except ImportError:
-    ML_AVAILABLE = False
+import numpy as np
 
 router = APIRouter()
 
+REPORT_CHUNK_SIZE = 5000
+
 
 @router.get("/{trip_id}")
 async def get_report(
     trip_id: int,
+    summary_only: bool = False,
+    event_offset: int = Query(0, ge=0),
+    event_limit: Optional[int] = Query(None, ge=1),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    # Get trip with events and signs
     result = await db.execute(
-        select(Trip)
-        .where(Trip.id == trip_id, Trip.user_id == current_user.id)
-        .options(selectinload(Trip.events), selectinload(Trip.sign_detections))
+        select(Trip).where(Trip.id == trip_id, Trip.user_id == current_user.id)
     )
     trip = result.scalar_one_or_none()
     
@@ -40,60 +37,179 @@ async def get_report(
             detail="Trip not found"
         )
     
-    # Generate report data
-    report = {
-        "trip_id": trip.id,
-        "summary": {
-            "start_time": trip.start_time.isoformat() if trip.start_time else None,
-            "end_time": trip.end_time.isoformat() if trip.end_time else None,
-            "duration_seconds": trip.duration_seconds,
-            "distance_km": round(trip.distance_m / 1000, 2) if trip.distance_m else 0,
-            "avg_speed_kmh": round(trip.avg_speed_m_s * 3.6, 2) if trip.avg_speed_m_s else 0,
-            "max_speed_kmh": round(trip.max_speed_m_s * 3.6, 2) if trip.max_speed_m_s else 0,
-            "unsafe_events": trip.unsafe_events
-        },
-        "events": [
-            {
-                "type": event.event_type,
-                "timestamp": event.timestamp.isoformat() if event.timestamp else None,
-                "location": {"lat": event.lat, "lon": event.lon},
-                "speed_kmh": round(event.speed_m_s * 3.6, 2) if event.speed_m_s else 0,
-                "acceleration": round(event.accel_m_s2, 2) if event.accel_m_s2 else 0
-            }
-            for event in trip.events
-        ],
-        "sign_detections": [
-            {
-                "timestamp": sign.ts.isoformat() if sign.ts else None,
-                "class": sign.class_name,
-                "confidence": round(sign.confidence, 3) if sign.confidence else 0,
-                "bbox": sign.bbox
-            }
-            for sign in trip.sign_detections
-        ],
-        "analytics": {
-            "event_breakdown": _get_event_breakdown(trip.events),
-            "recommendations": _generate_recommendations(trip)
-        }
+    event_breakdown = await _get_event_breakdown(db, trip_id)
+    result = await db.execute(
+        select(func.count()).select_from(SignDetection).where(SignDetection.trip_id == trip_id)
+    )
+    sign_total = result.scalar_one()
+    
+    summary = {
+        "start_time": trip.start_time.isoformat() if trip.start_time else None,
+        "end_time": trip.end_time.isoformat() if trip.end_time else None,
+        "duration_seconds": trip.duration_seconds,
+        "distance_km": round(trip.distance_m / 1000, 2) if trip.distance_m else 0,
+        "avg_speed_kmh": round(trip.avg_speed_m_s * 3.6, 2) if trip.avg_speed_m_s else 0,
+        "max_speed_kmh": round(trip.max_speed_m_s * 3.6, 2) if trip.max_speed_m_s else 0,
+        "unsafe_events": trip.unsafe_events
+    }
+    analytics = {
+        "event_breakdown": event_breakdown,
+        "recommendations": _generate_recommendations(event_breakdown)
     }
+    pagination = {
+        "event_offset": event_offset,
+        "event_limit": event_limit,
+        "events_total": sum(event_breakdown.values()),
+        "sign_detections_total": sign_total
+    }
+    
+    if summary_only:
+        return {"trip_id": trip.id, "summary": summary, "analytics": analytics, "pagination": pagination}
     
-    return report
+    events_query = (
+        select(
+            TripEvent.event_type,
+            cast(func.extract("epoch", TripEvent.timestamp), Float),
+            TripEvent.lat,
+            TripEvent.lon,
+            TripEvent.speed_m_s,
+            TripEvent.accel_m_s2,
+        )
+        .where(TripEvent.trip_id == trip_id)
+        .order_by(TripEvent.timestamp, TripEvent.id)
+        .offset(event_offset)
+        .limit(event_limit)
+        .execution_options(yield_per=REPORT_CHUNK_SIZE)
+    )
+    signs_query = (
+        select(
+            cast(func.extract("epoch", SignDetection.ts), Float),
+            SignDetection.class_name,
+            SignDetection.confidence,
+            SignDetection.bbox,
+            SignDetection.detection_count,
+        )
+        .where(SignDetection.trip_id == trip_id)
+        .order_by(SignDetection.ts, SignDetection.id)
+        .execution_options(yield_per=REPORT_CHUNK_SIZE)
+    )
+    
+    # Rows are streamed from a server-side cursor and serialised chunk by chunk
+    async def body():
+        yield f'{{"trip_id": {json.dumps(trip.id)}, "summary": {json.dumps(summary)}, "events": ['
+        first = True
+        async for rows in (await db.stream(events_query)).partitions():
+            yield ("" if first else ", ") + _format_events(rows)
+            first = False
+        yield '], "sign_detections": ['
+        first = True
+        async for rows in (await db.stream(signs_query)).partitions():
+            yield ("" if first else ", ") + _format_signs(rows)
+            first = False
+        yield f'], "analytics": {json.dumps(analytics)}, "pagination": {json.dumps(pagination)}}}'
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
-def _get_event_breakdown(events: List[TripEvent]) -> Dict[str, int]:
-    breakdown = {}
-    for event in events:
-        breakdown[event.event_type] = breakdown.get(event.event_type, 0) + 1
-    return breakdown
+@router.get("/{trip_id}/compliance")
+async def get_compliance(
+    trip_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    result = await db.execute(
+        select(Trip.id).where(Trip.id == trip_id, Trip.user_id == current_user.id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trip not found"
+        )
+    
+    result = await db.execute(select(SpeedCompliance).where(SpeedCompliance.trip_id == trip_id))
+    record = result.scalar_one_or_none()
+    
+    # Trips stored before compliance existed are evaluated on first request
+    if record is None:
+        record = await compliance.record_trip(
+            db,
+            trip_id,
+            min_confidence=settings.SPEED_SIGN_MIN_CONFIDENCE,
+            tolerance_kmh=settings.SPEED_LIMIT_TOLERANCE_KMH,
+            max_gap_s=settings.SPEED_COMPLIANCE_MAX_GAP_SECONDS,
+        )
+        await db.commit()
+    
+    return compliance.to_dict(record)
 
 
-def _generate_recommendations(trip: Trip) -> List[str]:
-    recommendations = []
+async def _get_event_breakdown(db: AsyncSession, trip_id: int) -> Dict[str, int]:
+    result = await db.execute(
+        select(TripEvent.event_type, func.count())
+        .where(TripEvent.trip_id == trip_id)
+        .group_by(TripEvent.event_type)
+    )
+    return {event_type: count for event_type, count in result.all()}
+
+
+def _format_events(rows: List[Any]) -> str:
+    """Serialise a chunk of event rows.
+
+    Conversions run per column in NumPy and each column is JSON-encoded
+    with a single ``json.dumps`` call, so no per-row dicts are built.
+    """
+    event_types, epochs, lats, lons, speeds, accels = zip(*rows)
+    encoded_types = {event_type: json.dumps(event_type) for event_type in set(event_types)}
+    timestamps = _json_column(_isoformat(epochs))
+    lats = _json_column(lats)
+    lons = _json_column(lons)
+    speed_kmh = _json_column(np.round(np.nan_to_num(np.array(speeds, dtype=np.float64)) * 3.6, 2).tolist())
+    acceleration = _json_column(np.round(np.nan_to_num(np.array(accels, dtype=np.float64)), 2).tolist())
+    
+    return ", ".join([
+        f'{{"type": {encoded_types[t]}, "timestamp": {ts}, "location": {{"lat": {la}, "lon": {lo}}}, '
+        f'"speed_kmh": {sp}, "acceleration": {ac}}}'
+        for t, ts, la, lo, sp, ac in zip(event_types, timestamps, lats, lons, speed_kmh, acceleration)
+    ])
+
+
+def _format_signs(rows: List[Any]) -> str:
+    epochs, class_names, confidences, bboxes, counts = zip(*rows)
+    timestamps = _isoformat(epochs)
+    confidence = np.round(np.nan_to_num(np.array(confidences, dtype=np.float64)), 3).tolist()
     
-    # Count event types
-    event_types = {}
-    for event in trip.events:
-        event_types[event.event_type] = event_types.get(event.event_type, 0) + 1
+    items = json.dumps([
+        {
+            "timestamp": timestamp,
+            "class": class_name,
+            "confidence": conf,
+            "bbox": bbox,
+            "count": count
+        }
+        for timestamp, class_name, conf, bbox, count in zip(timestamps, class_names, confidence, bboxes, counts)
+    ])
+    return items[1:-1]
+
+
+def _json_column(values) -> List[str]:
+    """JSON-encode a column of numbers, nulls or comma-free strings in one pass."""
+    return json.dumps(list(values))[1:-1].split(", ")
+
+
+def _isoformat(epochs) -> List[Optional[str]]:
+    epochs = np.array(epochs, dtype=np.float64)
+    valid = np.isfinite(epochs).tolist()
+    micros = np.round(np.nan_to_num(epochs) * 1e6).astype("datetime64[us]")
+    strings = np.datetime_as_string(micros, unit="us").tolist()
+    # datetime.isoformat() leaves out a zero fraction; match it
+    return [
+        f"{s[:-7] if s.endswith('.000000') else s}+00:00" if ok else None
+        for s, ok in zip(strings, valid)
+    ]
+
+
+def _generate_recommendations(event_types: Dict[str, int]) -> List[str]:
+    recommendations = []
     
     if event_types.get("hard_brake", 0) > 3:
         recommendations.append("Try to anticipate stops earlier to reduce hard braking events.")
@@ -151,38 +267,10 @@ async def predict_sign(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
-    if not ML_AVAILABLE:
+    if not inference.is_available():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="ML service not available"
         )
     
-    # Load image
-    image = Image.open(file.file).convert('RGB').resize((224, 224))
-    img_array = np.array(image) / 255.0
-    img_array = np.expand_dims(img_array, axis=0).astype(np.float32)
-    
-    # Dummy model prediction (replace with actual model)
-    # Assuming model outputs probabilities for classes
-    predictions = np.random.rand(1, len(labels))  # Replace with model.predict(img_array)
-    predicted_class_idx = np.argmax(predictions[0])
-    confidence = predictions[0][predicted_class_idx]
-    
-    return {
-        "class": labels[predicted_class_idx],
-        "confidence": float(confidence),
-        "bbox": [0.1, 0.1, 0.9, 0.9]  # Dummy bbox
-    }
-
-
-labels = [
-    'speed_limit_30',
-    'speed_limit_50',
-    'speed_limit_60',
-    'speed_limit_80',
-    'speed_limit_100',
-    'speed_limit_120',
-    'stop',
-    'yield',
-    'no_entry',
-]
+    return await inference.predict(await file.read())
@@ -1,63 +1,112 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from sqlalchemy.orm import selectinload
+from typing import Any, Dict, List, Literal, Optional, Type
+from collections import Counter
+import numpy as np
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.trip import Trip, TripEvent, SignDetection
 from app.schemas.trip import TripCreate, TripResponse, TripEventCreate, SignDetectionCreate
+from app.services import ingest, simplify, wire
 
 router = APIRouter()
 
 
-@router.post("/upload", response_model=TripResponse, status_code=status.HTTP_201_CREATED)
+def _inline_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    # openapi_extra is copied verbatim, so nested models can't point at $defs
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+
+# The body is parsed by hand to accept both encodings, so it is declared here
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": _inline_schema(TripCreate)},
+            wire.MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+}
+
+
+@router.post(
+    "/upload",
+    response_model=TripResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=UPLOAD_REQUEST_BODY,
+)
 async def upload_trip(
-    trip_data: TripCreate,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
+    body = await request.body()
+
+    if _media_type(request.headers.get("content-type")) == wire.MEDIA_TYPE:
+        try:
+            packed = wire.decode_trip(body)
+        except wire.WireFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        fields = packed.fields
+        sign_rows = packed.sign_detections
+        make_event_rows = packed.events.rows
+        event_counts = packed.events.type_counts()
+        columns = packed.events.columns
+        route = (columns["timestamp"], columns["lat"], columns["lon"])
+    else:
+        try:
+            trip_data = TripCreate.model_validate_json(body)
+        except ValidationError as e:
+            # Same error locations as a declared body parameter
+            raise RequestValidationError(
+                [dict(error, loc=("body", *error["loc"])) for error in e.errors(include_url=False)]
+            )
+        fields = trip_data.model_dump(exclude={"events", "sign_detections"})
+        sign_rows = [sign.model_dump() for sign in trip_data.sign_detections]
+        event_rows = [event.model_dump() for event in trip_data.events]
+        make_event_rows = lambda trip_id: [dict(row, trip_id=trip_id) for row in event_rows]
+        event_counts = Counter(row["event_type"] for row in event_rows)
+        route = (
+            wire.to_epoch([row["timestamp"] for row in event_rows]),
+            np.array([row["lat"] for row in event_rows], dtype=np.float64),
+            np.array([row["lon"] for row in event_rows], dtype=np.float64),
+        )
+
     # Create trip
-    new_trip = Trip(
-        user_id=current_user.id,
-        start_time=trip_data.start_time,
-        end_time=trip_data.end_time,
-        duration_seconds=trip_data.duration_seconds,
-        distance_m=trip_data.distance_m,
-        avg_speed_m_s=trip_data.avg_speed_m_s,
-        max_speed_m_s=trip_data.max_speed_m_s,
-        unsafe_events=trip_data.unsafe_events
-    )
+    new_trip = Trip(user_id=current_user.id, **fields)
     db.add(new_trip)
     await db.flush()
-    
-    # Create events
-    for event_data in trip_data.events:
-        event = TripEvent(
-            trip_id=new_trip.id,
-            event_type=event_data.event_type,
-            timestamp=event_data.timestamp,
-            lat=event_data.lat,
-            lon=event_data.lon,
-            speed_m_s=event_data.speed_m_s,
-            accel_m_s2=event_data.accel_m_s2
-        )
-        db.add(event)
-    
-    # Create sign detections
-    for sign_data in trip_data.sign_detections:
-        sign = SignDetection(
-            trip_id=new_trip.id,
-            ts=sign_data.ts,
-            class_name=sign_data.class_name,
-            confidence=sign_data.confidence,
-            bbox=sign_data.bbox
-        )
-        db.add(sign)
-    
+
+    # Bulk insert children instead of one ORM object per row
+    event_rows = make_event_rows(new_trip.id)
+    for row, tolerance in zip(event_rows, simplify.route_tolerances(*route).tolist()):
+        row["route_tolerance_m"] = tolerance
+    if event_rows:
+        await db.execute(insert(TripEvent), event_rows)
+    await ingest.store_sign_detections(db, new_trip.id, sign_rows)
+
+    await ingest.finalize_trip(db, new_trip, event_counts)
+
     await db.commit()
-    await db.refresh(new_trip)
-    
-    return new_trip
+
+    return await _trip_response(request, db, new_trip.id, current_user.id)
 
 
 @router.get("/", response_model=List[TripResponse])
@@ -67,9 +116,6 @@ async def get_trips(
     skip: int = 0,
     limit: int = 100
 ):
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-    
     result = await db.execute(
         select(Trip)
         .where(Trip.user_id == current_user.id)
@@ -82,26 +128,124 @@ async def get_trips(
     return trips
 
 
-@router.get("/{trip_id}", response_model=TripResponse)
+@router.get(
+    "/{trip_id}",
+    response_model=TripResponse,
+    responses={200: {"content": {wire.MEDIA_TYPE: {}}}},
+)
 async def get_trip(
     trip_id: int,
+    request: Request,
+    resolution: Literal["full", "high", "medium", "low"] = "full",
+    tolerance_m: Optional[float] = Query(None, ge=0),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-    
+    # An explicit tolerance overrides the named resolution
+    if tolerance_m is None:
+        tolerance_m = simplify.RESOLUTION_TOLERANCES_M[resolution]
+    return await _trip_response(request, db, trip_id, current_user.id, tolerance_m)
+
+
+async def _trip_response(request: Request, db: AsyncSession, trip_id: int, user_id: int,
+                         tolerance_m: float = 0.0):
+    if wire.MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(
+            content=await _pack_trip(db, trip_id, user_id, tolerance_m),
+            media_type=wire.MEDIA_TYPE,
+            status_code=status.HTTP_201_CREATED if request.method == "POST" else status.HTTP_200_OK,
+        )
+
+    events = Trip.events
+    if tolerance_m > 0:
+        events = events.and_(_route_filter(tolerance_m))
     result = await db.execute(
         select(Trip)
-        .where(Trip.id == trip_id, Trip.user_id == current_user.id)
-        .options(selectinload(Trip.events), selectinload(Trip.sign_detections))
+        .where(Trip.id == trip_id, Trip.user_id == user_id)
+        .options(selectinload(events), selectinload(Trip.sign_detections))
     )
     trip = result.scalar_one_or_none()
-    
+
     if not trip:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Trip not found"
         )
-    
+
     return trip
+
+
+async def _pack_trip(db: AsyncSession, trip_id: int, user_id: int, tolerance_m: float) -> bytes:
+    result = await db.execute(
+        select(Trip).where(Trip.id == trip_id, Trip.user_id == user_id)
+    )
+    trip = result.scalar_one_or_none()
+
+    if not trip:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trip not found"
+        )
+
+    # Fetch event columns directly, no ORM objects per row
+    events_query = (
+        select(
+            TripEvent.id, TripEvent.event_type, TripEvent.timestamp, TripEvent.lat,
+            TripEvent.lon, TripEvent.speed_m_s, TripEvent.accel_m_s2,
+        )
+        .where(TripEvent.trip_id == trip_id)
+        .order_by(TripEvent.timestamp, TripEvent.id)
+    )
+    if tolerance_m > 0:
+        events_query = events_query.where(_route_filter(tolerance_m))
+    result = await db.execute(events_query)
+    rows = result.all()
+    ids, event_types, timestamps, lats, lons, speeds, accels = (
+        list(zip(*rows)) if rows else [()] * 7
+    )
+    events = {
+        "id": np.asarray(ids, dtype=np.int64),
+        "event_type": event_types,
+        "timestamp": wire.to_epoch(timestamps),
+        "lat": np.asarray(lats, dtype=np.float64),
+        "lon": np.asarray(lons, dtype=np.float64),
+        "speed_m_s": np.asarray(speeds, dtype=np.float32),
+        "accel_m_s2": np.asarray(accels, dtype=np.float32),
+    }
+
+    result = await db.execute(
+        select(
+            SignDetection.id, SignDetection.ts, SignDetection.class_name,
+            SignDetection.confidence, SignDetection.bbox, SignDetection.detection_count,
+            SignDetection.last_ts, SignDetection.mean_confidence,
+        )
+        .where(SignDetection.trip_id == trip_id)
+        .order_by(SignDetection.ts, SignDetection.id)
+    )
+    signs = [row._asdict() for row in result.all()]
+
+    return wire.encode_trip(
+        {
+            "id": trip.id,
+            "user_id": trip.user_id,
+            "start_time": trip.start_time,
+            "end_time": trip.end_time,
+            "duration_seconds": trip.duration_seconds,
+            "distance_m": trip.distance_m,
+            "avg_speed_m_s": trip.avg_speed_m_s,
+            "max_speed_m_s": trip.max_speed_m_s,
+            "unsafe_events": trip.unsafe_events,
+            "created_at": trip.created_at,
+        },
+        events,
+        signs,
+    )
+
+
+def _route_filter(tolerance_m: float):
+    # Rows stored before simplification existed have no tolerance and are kept
+    return or_(TripEvent.route_tolerance_m.is_(None), TripEvent.route_tolerance_m > tolerance_m)
+
+
+def _media_type(content_type: str) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
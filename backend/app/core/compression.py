@@ -0,0 +1,123 @@
+import zlib
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ResponseCompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves streaming endpoints alone.
+
+    Gzip buffers small writes, which would hold back server-sent events,
+    so paths under ``excluded_paths`` are passed through uncompressed.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9,
+                 excluded_paths: tuple = ()):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.excluded_paths = tuple(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class RequestDecompressionMiddleware:
+    """Accept ``Content-Encoding: gzip`` request bodies.
+
+    The body is inflated incrementally as chunks arrive and decompression
+    stops as soon as the output exceeds ``max_body_size``, so a small
+    compressed payload cannot expand into an unbounded buffer.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, paths: tuple = ()):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = Headers(scope=scope).get("content-encoding", "").strip().lower()
+        if encoding in ("", "identity"):
+            await self.app(scope, receive, send)
+            return
+
+        if self.paths and not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        if encoding != "gzip":
+            response = PlainTextResponse("Unsupported Content-Encoding", status_code=415)
+            await response(scope, receive, send)
+            return
+
+        try:
+            body = await self._inflate(receive)
+        except _BodyTooLarge:
+            response = PlainTextResponse("Decompressed body too large", status_code=413)
+            await response(scope, receive, send)
+            return
+        except zlib.error:
+            response = PlainTextResponse("Malformed gzip body", status_code=400)
+            await response(scope, receive, send)
+            return
+
+        # Downstream sees a plain body with a matching Content-Length
+        headers = [
+            (key, value) for key, value in scope["headers"]
+            if key not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=headers)
+
+        sent = False
+
+        async def receive_inflated() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_inflated, send)
+
+    async def _inflate(self, receive: Receive) -> bytes:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = []
+        total = 0
+        more_body = True
+
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise zlib.error("client disconnected")
+            more_body = message.get("more_body", False)
+            data = message.get("body", b"")
+
+            while data:
+                out = decompressor.decompress(data, self.max_body_size - total + 1)
+                total += len(out)
+                if total > self.max_body_size:
+                    raise _BodyTooLarge()
+                chunks.append(out)
+                data = decompressor.unconsumed_tail
+
+        tail = decompressor.flush()
+        total += len(tail)
+        if total > self.max_body_size:
+            raise _BodyTooLarge()
+        chunks.append(tail)
+
+        if not decompressor.eof:
+            raise zlib.error("truncated gzip stream")
+
+        return b"".join(chunks)
+
+
+class _BodyTooLarge(Exception):
+    pass
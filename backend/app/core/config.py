@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -7,9 +7,56 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 300
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 30
+    # Changing this rehashes each password on the user's next login
+    PASSWORD_HASH_ROUNDS: Optional[int] = None
+    # Accounts allowed to see fleet-wide data and other drivers' live trips
+    OPERATOR_EMAILS: List[str] = []
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     CORS_ORIGINS: List[str] = ["*"]
+    # Development convenience; production runs `alembic upgrade head` once instead
+    AUTO_CREATE_SCHEMA: bool = True
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+    MAX_DECOMPRESSED_BODY_BYTES: int = 32 * 1024 * 1024
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "300/minute"
+    # Proxies in front of the app that append to X-Forwarded-For (1 on Render)
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 0
+    RATE_LIMITS: Dict[str, str] = {
+        "/api/v1/auth": "20/minute",
+        "/api/v1/trips/upload": "60/minute",
+        "/api/v1/reports/predict_sign": "30/minute",
+    }
+    # Repeated detections of one sign within this window and overlap are stored once
+    SIGN_CLUSTER_WINDOW_SECONDS: float = 1.0
+    SIGN_CLUSTER_MIN_IOU: float = 0.3
+    SIGN_DETECTIONS_KEEP_RAW: bool = False
+    SPEED_SIGN_MIN_CONFIDENCE: float = 0.6
+    SPEED_LIMIT_TOLERANCE_KMH: float = 0.0
+    SPEED_COMPLIANCE_MAX_GAP_SECONDS: float = 10.0
+    LIVE_FLUSH_BATCH: int = 500
+    LIVE_FLUSH_INTERVAL_SECONDS: float = 5.0
+    LIVE_SUBSCRIBER_QUEUE_SIZE: int = 256
+    LIVE_KEEPALIVE_SECONDS: float = 15.0
+    EXPORT_DIR: str = "exports"
+    EXPORT_BATCH_SIZE: int = 5000
+    EXPORT_RETENTION_HOURS: float = 24
+    # Unfinished export jobs without a heartbeat for this long are marked failed
+    EXPORT_JOB_STALE_SECONDS: float = 300
+    SIGN_MODEL_PATH: Optional[str] = None
+    INFERENCE_MODE: Literal["thread", "process"] = "thread"
+    # Model processes per API worker when INFERENCE_MODE is "process"
+    INFERENCE_WORKERS: int = 1
+    CONCURRENCY_LIMITS: Dict[str, int] = {
+        "/api/v1/trips/upload": 16,
+        "/api/v1/reports/predict_sign": 4,
+    }
     
     class Config:
         env_file = ".env"
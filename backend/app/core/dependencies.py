@@ -1,13 +1,38 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User
-from sqlalchemy import select
+from app.core.tokens import RevocationList, TokenVerifier
+from app.models.user import User, RevokedToken
+from sqlalchemy import func, or_, select
+from typing import Optional
 
 security = HTTPBearer()
+token_verifier = TokenVerifier(
+    settings.JWT_SECRET_KEY,
+    settings.JWT_ALGORITHM,
+    max_entries=settings.TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+revocations = RevocationList(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> Optional[User]:
+    payload = token_verifier.verify(token)
+    if payload is None:
+        return None
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        return None
+    
+    await sync_revocations(db)
+    if payload.get("jti") and revocations.is_revoked(payload["jti"]):
+        return None
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalar_one_or_none()
 
 
 async def get_current_user(
@@ -20,21 +45,40 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
-        user_id = int(payload.get("sub"))
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await authenticate_token(credentials.credentials, db)
     
     if user is None:
         raise credentials_exception
     
     return user
+
+
+def is_operator(user: User) -> bool:
+    return user.email.lower() in {email.lower() for email in settings.OPERATOR_EMAILS}
+
+
+async def get_operator_user(current_user: User = Depends(get_current_user)) -> User:
+    if not is_operator(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator access required"
+        )
+    return current_user
+
+
+async def sync_revocations(db: AsyncSession) -> None:
+    if not revocations.sync_due():
+        return
+    query = select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at).where(
+        or_(RevokedToken.expires_at.is_(None), RevokedToken.expires_at > func.now())
+    )
+    max_id = None
+    if revocations.last_id is None:
+        max_id = (await db.execute(select(func.max(RevokedToken.id)))).scalar_one()
+    else:
+        query = query.where(or_(
+            RevokedToken.id > revocations.last_id,
+            RevokedToken.id.in_(revocations.pending_ids),
+        ))
+    result = await db.execute(query)
+    revocations.merge(result.all(), max_id=max_id)
@@ -0,0 +1,160 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.tokens import TokenVerifier
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parse ``"10/minute"`` into (burst capacity, tokens refilled per second)."""
+    count, _, period = rate.partition("/")
+    capacity = int(count)
+    seconds = PERIODS[period.strip().rstrip("s")]
+    if capacity <= 0:
+        raise ValueError(f"Rate must allow at least one request: {rate!r}")
+    return capacity, capacity / seconds
+
+
+class RateLimitBackend(ABC):
+    """Token bucket store. Subclass to share buckets between processes."""
+
+    @abstractmethod
+    async def consume(self, key: str, capacity: int, refill_per_s: float) -> float:
+        """Take one token; return 0 when allowed, else seconds until a token is available."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> (tokens, last update, capacity, refill per second)
+        self._buckets: Dict[str, Tuple[float, float, int, float]] = {}
+
+    async def consume(self, key: str, capacity: int, refill_per_s: float) -> float:
+        now = self.clock()
+        tokens, updated, _, _ = self._buckets.get(key, (capacity, now, capacity, refill_per_s))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_s)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now, capacity, refill_per_s)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0.0
+
+        self._buckets[key] = (tokens, now, capacity, refill_per_s)
+        return (1 - tokens) / refill_per_s
+
+    def _prune(self, now: float) -> None:
+        # Buckets that would be full again carry no state worth keeping
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[3] < bucket[2]
+        }
+
+
+class RateLimitMiddleware:
+    """Per-route token buckets plus per-process concurrency caps.
+
+    Requests are keyed by the ``sub`` claim of a valid bearer token and
+    fall back to the client IP, which is always used for ``ip_prefixes``.
+    Behind ``trusted_proxy_hops`` proxies the IP is read from that many
+    entries from the right of X-Forwarded-For, the part a client can't forge.
+    Rules and caps are matched on the longest path prefix.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rates: Dict[str, str],
+        concurrency: Dict[str, int],
+        verifier: TokenVerifier,
+        default_rate: Optional[str] = None,
+        ip_prefixes: Tuple[str, ...] = ("/api/v1/auth",),
+        trusted_proxy_hops: int = 0,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.app = app
+        self.rates = {prefix: parse_rate(rate) for prefix, rate in rates.items()}
+        self.default_rate = parse_rate(default_rate) if default_rate else None
+        self.concurrency = dict(concurrency)
+        self.verifier = verifier
+        self.ip_prefixes = tuple(ip_prefixes)
+        self.trusted_proxy_hops = trusted_proxy_hops
+        self.backend = backend or InMemoryRateLimitBackend()
+        self._in_flight: Dict[str, int] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        prefix = _longest_prefix(path, self.rates)
+        rate = self.rates[prefix] if prefix else self.default_rate
+
+        if rate:
+            key = f"{prefix or '*'}:{self._identity(scope)}"
+            retry_after = await self.backend.consume(key, *rate)
+            if retry_after > 0:
+                await _reject(429, "Rate limit exceeded", retry_after, scope, receive, send)
+                return
+
+        cap_prefix = _longest_prefix(path, self.concurrency)
+        if cap_prefix is None:
+            await self.app(scope, receive, send)
+            return
+
+        in_flight = self._in_flight.get(cap_prefix, 0)
+        if in_flight >= self.concurrency[cap_prefix]:
+            await _reject(503, "Server busy, retry shortly", 1, scope, receive, send)
+            return
+
+        self._in_flight[cap_prefix] = in_flight + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight[cap_prefix] -= 1
+
+    def _identity(self, scope: Scope) -> str:
+        headers = Headers(scope=scope)
+        if not scope["path"].startswith(self.ip_prefixes):
+            authorization = headers.get("authorization", "")
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = self.verifier.verify(token)
+                if payload and payload.get("sub") is not None:
+                    return f"user:{payload['sub']}"
+        return f"ip:{self._client_ip(scope, headers)}"
+
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
+        if self.trusted_proxy_hops:
+            forwarded = [
+                host.strip()
+                for value in headers.getlist("x-forwarded-for")
+                for host in value.split(",")
+                if host.strip()
+            ]
+            if len(forwarded) >= self.trusted_proxy_hops:
+                return forwarded[-self.trusted_proxy_hops]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+
+def _longest_prefix(path: str, table: Dict[str, object]) -> Optional[str]:
+    matches = [prefix for prefix in table if path.startswith(prefix)]
+    return max(matches, key=len) if matches else None
+
+
+async def _reject(status_code: int, detail: str, retry_after: float,
+                  scope: Scope, receive: Receive, send: Send) -> None:
+    response = JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+    await response(scope, receive, send)
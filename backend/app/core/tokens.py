@@ -0,0 +1,135 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from jose import JWTError, jwt
+
+
+class TokenVerifier:
+    """JWT verification with an LRU cache of already verified tokens.
+
+    Entries are keyed by the SHA-256 of the token, never the token itself,
+    and expire at the token's ``exp`` or after ``ttl_seconds``, whichever
+    comes first.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, max_entries: int = 10_000,
+                 ttl_seconds: float = 300, clock: Callable[[], float] = time.time):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        key = hashlib.sha256(token.encode()).digest()
+        now = self.clock()
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            claims, expires_at = entry
+            if now < expires_at:
+                self._cache.move_to_end(key)
+                return claims
+            del self._cache[key]
+
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError:
+            return None
+
+        expires_at = now + self.ttl_seconds
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        self._cache[key] = (claims, expires_at)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return claims
+
+    def forget(self, token: str) -> None:
+        self._cache.pop(hashlib.sha256(token.encode()).digest(), None)
+
+
+# Ids below the table's max on first sync that are watched for late commits
+INITIAL_GAP_WINDOW = 100
+
+
+class RevocationList:
+    """Revoked token ids held in memory and refreshed from the database.
+
+    Lookups are a set membership test. Each process pulls rows added
+    since its last sync at most every ``sync_interval`` seconds, which
+    bounds how long a token revoked in another worker stays usable here.
+
+    Syncs are keyed on the row id. Ids are assigned at insert but rows
+    become visible at commit, so a lower id can appear after a higher one;
+    ids skipped over are re-queried until they show up or ``gap_timeout``
+    passes (sequence values are also consumed by rolled back inserts).
+    """
+
+    def __init__(self, sync_interval: float = 30.0, gap_timeout: float = 300.0,
+                 max_gaps: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.sync_interval = sync_interval
+        self.gap_timeout = gap_timeout
+        self.max_gaps = max_gaps
+        self.clock = clock
+        self.last_id: Optional[int] = None
+        self._gaps: Dict[int, float] = {}
+        self._expiry: Dict[str, float] = {}
+        self._synced_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    @property
+    def pending_ids(self) -> List[int]:
+        return list(self._gaps)
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._expiry
+
+    def add(self, jti: str, expires_at: Optional[datetime]) -> None:
+        self._expiry[jti] = expires_at.timestamp() if expires_at else float("inf")
+
+    def sync_due(self) -> bool:
+        # Claims the slot up front so concurrent requests don't all query
+        now = self.clock()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return False
+        self._synced_at = now
+        return True
+
+    def merge(self, rows: Iterable[Tuple[int, str, Optional[datetime]]],
+              max_id: Optional[int] = None) -> None:
+        """Apply ``(id, jti, expires_at)`` rows from a sync.
+
+        The first sync passes the table's ``max_id``; the ids just below it
+        that weren't returned may still be uncommitted and are watched too.
+        """
+        now = self.clock()
+        rows = sorted(rows)
+        if self.last_id is None:
+            seen = {row[0] for row in rows}
+            self.last_id = max_id or 0
+            for row_id in range(max(1, self.last_id - INITIAL_GAP_WINDOW), self.last_id + 1):
+                if row_id not in seen:
+                    self._gaps[row_id] = now
+
+        for row_id, jti, expires_at in rows:
+            self.add(jti, expires_at)
+            self._gaps.pop(row_id, None)
+            if row_id > self.last_id:
+                for missing in range(max(self.last_id + 1, row_id - self.max_gaps), row_id):
+                    self._gaps[missing] = now
+                self.last_id = row_id
+
+        self._gaps = {
+            row_id: seen for row_id, seen in self._gaps.items() if now - seen < self.gap_timeout
+        }
+        if len(self._gaps) > self.max_gaps:
+            self._gaps = dict(sorted(self._gaps.items())[-self.max_gaps:])
+
+        wall_now = datetime.now(timezone.utc).timestamp()
+        self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > wall_now}
@@ -1,4 +1,5 @@
-from .user import User
-from .trip import Trip, TripEvent, SignDetection
+from .user import User, RevokedToken
+from .trip import Trip, TripEvent, SignDetection, SignDetectionRaw, SpeedCompliance
+from .fleet import DriverDailyStats
 
-__all__ = ["User", "Trip", "TripEvent", "SignDetection"]
+__all__ = ["User", "RevokedToken", "Trip", "TripEvent", "SignDetection", "SignDetectionRaw", "SpeedCompliance", "DriverDailyStats"]
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+# Per-driver totals for one UTC day, updated on every trip upload
+class DriverDailyStats(Base):
+    __tablename__ = "driver_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_driver_daily_stats_user_day"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False, index=True)
+    trip_count = Column(Integer, nullable=False, default=0)
+    distance_m = Column(Float, nullable=False, default=0)
+    duration_seconds = Column(Integer, nullable=False, default=0)
+    unsafe_events = Column(Integer, nullable=False, default=0)
+    event_counts = Column(JSON, nullable=False, default=dict)  # event_type -> count
+    rate_sketch = Column(JSON)  # QuantileSketch of unsafe events per 100 km, per trip
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -33,8 +33,13 @@ class TripEvent(Base):
     lon = Column(Float)
     speed_m_s = Column(Float)
     accel_m_s2 = Column(Float)
+    route_tolerance_m = Column(Float)  # kept on the map at tolerances below this, see services/simplify.py
     
     trip = relationship("Trip", back_populates="events")
+    
+    __table_args__ = (
+        Index("ix_trip_events_trip_id_route_tolerance_m", "trip_id", "route_tolerance_m"),
+    )
 
 
 class SignDetection(Base):
@@ -44,7 +49,39 @@ class SignDetection(Base):
     trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False)
     ts = Column(DateTime(timezone=True))
     class_name = Column(String)  # e.g. 'speed_limit_60'
-    confidence = Column(Float)
-    bbox = Column(JSON)  # JSONB in PostgreSQL
+    confidence = Column(Float)  # highest in the cluster
+    bbox = Column(JSON)  # JSONB in PostgreSQL, of the highest-confidence frame
+    detection_count = Column(Integer, nullable=False, default=1, server_default="1")
+    last_ts = Column(DateTime(timezone=True))
+    mean_confidence = Column(Float)
     
     trip = relationship("Trip", back_populates="sign_detections")
+
+
+class SignDetectionRaw(Base):
+    # Per-frame detections behind each clustered row, only kept when enabled
+    __tablename__ = "sign_detections_raw"
+    
+    id = Column(Integer, primary_key=True)
+    trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False, index=True)
+    sign_detection_id = Column(Integer, ForeignKey("sign_detections.id"), nullable=False)
+    ts = Column(DateTime(timezone=True))
+    class_name = Column(String)
+    confidence = Column(Float)
+    bbox = Column(JSON)
+
+
+class SpeedCompliance(Base):
+    __tablename__ = "speed_compliance"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False, unique=True)
+    samples = Column(Integer, nullable=False, default=0)
+    samples_with_limit = Column(Integer, nullable=False, default=0)
+    samples_over_limit = Column(Integer, nullable=False, default=0)
+    time_with_limit_s = Column(Float, nullable=False, default=0)
+    time_over_limit_s = Column(Float, nullable=False, default=0)
+    distance_over_limit_m = Column(Float, nullable=False, default=0)
+    max_excess_kmh = Column(Float, nullable=False, default=0)
+    by_limit = Column(JSON)  # limit km/h -> {time_s, time_over_s}
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,7 +1,9 @@
 from .user import UserCreate, UserResponse, Token
-from .trip import TripCreate, TripResponse, TripEventCreate, SignDetectionCreate
+from .trip import TripSummary, TripCreate, TripResponse, TripEventCreate, SignDetectionCreate, LiveTripClose
+from .export import ExportJobCreate, ExportJobResponse
 
 __all__ = [
     "UserCreate", "UserResponse", "Token",
-    "TripCreate", "TripResponse", "TripEventCreate", "SignDetectionCreate"
+    "TripSummary", "TripCreate", "TripResponse", "TripEventCreate", "SignDetectionCreate", "LiveTripClose",
+    "ExportJobCreate", "ExportJobResponse"
 ]
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List, Literal
+
+
+class ExportJobCreate(BaseModel):
+    kind: Literal["trips", "events"] = "events"
+    format: Literal["csv", "parquet"] = "csv"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    event_types: Optional[List[str]] = None
+
+
+class ExportJobResponse(BaseModel):
+    id: str
+    kind: str
+    format: str
+    status: str
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    event_types: Optional[List[str]] = None
+    rows: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -19,18 +19,30 @@ class SignDetectionCreate(BaseModel):
     bbox: Dict[str, Any]
 
 
-class TripCreate(BaseModel):
+class TripSummary(BaseModel):
     start_time: datetime
     end_time: datetime
-    duration_seconds: int
-    distance_m: float
-    avg_speed_m_s: float
-    max_speed_m_s: float
-    unsafe_events: int
+    duration_seconds: int = Field(ge=0)
+    distance_m: float = Field(ge=0, allow_inf_nan=False)
+    avg_speed_m_s: float = Field(ge=0, allow_inf_nan=False)
+    max_speed_m_s: float = Field(ge=0, allow_inf_nan=False)
+    unsafe_events: int = Field(ge=0)
+
+
+class TripCreate(TripSummary):
     events: List[TripEventCreate] = []
     sign_detections: List[SignDetectionCreate] = []
 
 
+class LiveTripClose(BaseModel):
+    end_time: Optional[datetime] = None
+    duration_seconds: Optional[int] = Field(None, ge=0)
+    distance_m: Optional[float] = Field(None, ge=0, allow_inf_nan=False)
+    avg_speed_m_s: Optional[float] = Field(None, ge=0, allow_inf_nan=False)
+    max_speed_m_s: Optional[float] = Field(None, ge=0, allow_inf_nan=False)
+    unsafe_events: Optional[int] = Field(None, ge=0)
+
+
 class TripEventResponse(BaseModel):
     id: int
     event_type: str
@@ -50,6 +62,9 @@ class SignDetectionResponse(BaseModel):
     class_name: str
     confidence: float
     bbox: Dict[str, Any]
+    detection_count: int = 1
+    last_ts: Optional[datetime] = None
+    mean_confidence: Optional[float] = None
     
     class Config:
         from_attributes = True
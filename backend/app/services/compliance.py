@@ -0,0 +1,148 @@
+"""Speed-limit compliance from sign detections and speed telemetry.
+
+The in-force limit at each speed sample is the most recent confident
+speed-limit detection at or before it, found for all samples at once
+with ``np.searchsorted`` (an as-of merge). Cost is linear in trip length
+apart from sorting the inputs.
+"""
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.trip import TripEvent, SignDetection, SpeedCompliance
+from app.services import wire
+
+SPEED_LIMIT_CLASS = re.compile(r"^speed_limit_(\d+)$")
+
+
+def parse_speed_limit(class_name: Optional[str]) -> float:
+    match = SPEED_LIMIT_CLASS.match(class_name or "")
+    return float(match.group(1)) if match else np.nan
+
+
+def evaluate(
+    event_ts: np.ndarray,
+    speed_m_s: np.ndarray,
+    sign_ts: np.ndarray,
+    sign_classes: Sequence[str],
+    sign_confidence: np.ndarray,
+    min_confidence: float,
+    tolerance_kmh: float = 0.0,
+    max_gap_s: float = 10.0,
+) -> Dict[str, Any]:
+    """Time and distance spent above the in-force limit.
+
+    Timestamps are epoch seconds. Each speed sample holds until the next
+    one, for at most ``max_gap_s`` so sparse telemetry is not stretched
+    across long gaps.
+    """
+    event_ts = np.asarray(event_ts, dtype=np.float64)
+    speed_m_s = np.nan_to_num(np.asarray(speed_m_s, dtype=np.float64))
+    valid = np.isfinite(event_ts)
+    event_ts, speed_m_s = event_ts[valid], speed_m_s[valid]
+    order = np.argsort(event_ts, kind="stable")
+    event_ts, speed_m_s = event_ts[order], speed_m_s[order]
+
+    limits = np.fromiter(
+        (parse_speed_limit(name) for name in sign_classes), dtype=np.float64, count=len(sign_classes)
+    )
+    sign_ts = np.asarray(sign_ts, dtype=np.float64)
+    keep = (
+        np.isfinite(limits)
+        & np.isfinite(sign_ts)
+        & (np.nan_to_num(np.asarray(sign_confidence, dtype=np.float64)) >= min_confidence)
+    )
+    sign_ts, limits = sign_ts[keep], limits[keep]
+    sign_order = np.argsort(sign_ts, kind="stable")
+    sign_ts, limits = sign_ts[sign_order], limits[sign_order]
+
+    # As-of merge: index of the latest sign at or before each sample
+    idx = np.searchsorted(sign_ts, event_ts, side="right") - 1
+    in_force = idx >= 0
+    limit_kmh = np.where(in_force, limits[np.clip(idx, 0, None)] if len(limits) else np.nan, np.nan)
+
+    dt = np.zeros_like(event_ts)
+    if len(event_ts) > 1:
+        dt[:-1] = np.minimum(np.diff(event_ts), max_gap_s)
+
+    speed_kmh = speed_m_s * 3.6
+    excess_kmh = speed_kmh - limit_kmh
+    over = in_force & (excess_kmh > tolerance_kmh)
+
+    by_limit = {}
+    for limit in np.unique(limit_kmh[in_force]):
+        at_limit = in_force & (limit_kmh == limit)
+        by_limit[str(int(limit))] = {
+            "time_s": round(float(dt[at_limit].sum()), 2),
+            "time_over_s": round(float(dt[at_limit & over].sum()), 2),
+        }
+
+    return {
+        "samples": int(len(event_ts)),
+        "samples_with_limit": int(in_force.sum()),
+        "samples_over_limit": int(over.sum()),
+        "time_with_limit_s": round(float(dt[in_force].sum()), 2),
+        "time_over_limit_s": round(float(dt[over].sum()), 2),
+        "distance_over_limit_m": round(float((speed_m_s * dt)[over].sum()), 2),
+        "max_excess_kmh": round(float(excess_kmh[over].max()), 2) if over.any() else 0.0,
+        "by_limit": by_limit,
+    }
+
+
+async def record_trip(
+    db: AsyncSession,
+    trip_id: int,
+    min_confidence: float,
+    tolerance_kmh: float,
+    max_gap_s: float,
+) -> SpeedCompliance:
+    """Compute and store compliance for a trip whose rows are already written."""
+    result = await db.execute(
+        select(TripEvent.timestamp, TripEvent.speed_m_s).where(TripEvent.trip_id == trip_id)
+    )
+    events = result.all()
+    result = await db.execute(
+        select(SignDetection.ts, SignDetection.class_name, SignDetection.confidence)
+        .where(SignDetection.trip_id == trip_id)
+    )
+    signs = result.all()
+
+    metrics = evaluate(
+        event_ts=wire.to_epoch([row.timestamp for row in events]),
+        speed_m_s=np.array([row.speed_m_s for row in events], dtype=np.float64),
+        sign_ts=wire.to_epoch([row.ts for row in signs]),
+        sign_classes=[row.class_name for row in signs],
+        sign_confidence=np.array([row.confidence for row in signs], dtype=np.float64),
+        min_confidence=min_confidence,
+        tolerance_kmh=tolerance_kmh,
+        max_gap_s=max_gap_s,
+    )
+
+    # Upsert, so concurrent first requests for an older trip don't collide
+    values = dict(metrics, computed_at=datetime.now(timezone.utc))
+    statement = pg_insert(SpeedCompliance).values(trip_id=trip_id, **values)
+    statement = statement.on_conflict_do_update(
+        index_elements=["trip_id"],
+        set_={key: statement.excluded[key] for key in values},
+    ).returning(SpeedCompliance)
+    result = await db.scalars(statement, execution_options={"populate_existing": True})
+    return result.one()
+
+
+def to_dict(record: SpeedCompliance) -> Dict[str, Any]:
+    return {
+        "trip_id": record.trip_id,
+        "samples": record.samples,
+        "samples_with_limit": record.samples_with_limit,
+        "samples_over_limit": record.samples_over_limit,
+        "time_with_limit_s": record.time_with_limit_s,
+        "time_over_limit_s": record.time_over_limit_s,
+        "distance_over_limit_m": record.distance_over_limit_m,
+        "max_excess_kmh": record.max_excess_kmh,
+        "by_limit": record.by_limit,
+        "computed_at": record.computed_at.isoformat() if record.computed_at else None,
+    }
+
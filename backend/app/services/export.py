@@ -0,0 +1,278 @@
+"""Constant-memory export of a driver's trips and events.
+
+Rows are read through server-side cursors (``yield_per``) and written out
+one partition at a time, as CSV text for streamed downloads or as
+Parquet row groups for background jobs. Job state is a JSON file next to
+the output so any worker can report on it.
+"""
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from pydantic import TypeAdapter
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models.trip import Trip, TripEvent
+
+logger = logging.getLogger(__name__)
+
+_DATETIME = TypeAdapter(datetime)
+
+# Optional columnar output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+TRIP_COLUMNS = (
+    "id", "start_time", "end_time", "duration_seconds", "distance_m",
+    "avg_speed_m_s", "max_speed_m_s", "unsafe_events", "created_at",
+)
+EVENT_COLUMNS = (
+    "trip_id", "id", "event_type", "timestamp", "lat", "lon", "speed_m_s", "accel_m_s2",
+)
+
+
+def build_query(
+    kind: str,
+    user_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_types: Optional[Sequence[str]] = None,
+) -> Select:
+    if kind == "trips":
+        query = (
+            select(*(getattr(Trip, name) for name in TRIP_COLUMNS))
+            .where(Trip.user_id == user_id)
+            .order_by(Trip.start_time, Trip.id)
+        )
+        if start is not None:
+            query = query.where(Trip.start_time >= start)
+        if end is not None:
+            query = query.where(Trip.start_time < end)
+        if event_types:
+            query = query.where(
+                select(TripEvent.id)
+                .where(TripEvent.trip_id == Trip.id, TripEvent.event_type.in_(event_types))
+                .exists()
+            )
+        return query
+
+    query = (
+        select(*(getattr(TripEvent, name) for name in EVENT_COLUMNS))
+        .join(Trip, Trip.id == TripEvent.trip_id)
+        .where(Trip.user_id == user_id)
+        .order_by(TripEvent.trip_id, TripEvent.timestamp, TripEvent.id)
+    )
+    if start is not None:
+        query = query.where(TripEvent.timestamp >= start)
+    if end is not None:
+        query = query.where(TripEvent.timestamp < end)
+    if event_types:
+        query = query.where(TripEvent.event_type.in_(event_types))
+    return query
+
+
+def columns_for(kind: str) -> Sequence[str]:
+    return TRIP_COLUMNS if kind == "trips" else EVENT_COLUMNS
+
+
+async def iter_partitions(db: AsyncSession, query: Select, batch_size: int) -> AsyncIterator[List[Any]]:
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def iter_csv(db: AsyncSession, kind: str, query: Select, batch_size: int) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns_for(kind))
+    yield _drain(buffer)
+
+    async for rows in iter_partitions(db, query, batch_size):
+        writer.writerows(_csv_rows(rows))
+        yield _drain(buffer)
+
+
+def _csv_rows(rows: List[Any]):
+    return (
+        [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        for row in rows
+    )
+
+
+def _drain(buffer: io.StringIO) -> str:
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def _parquet_schema(kind: str):
+    timestamp = pa.timestamp("us", tz="UTC")
+    if kind == "trips":
+        return pa.schema([
+            ("id", pa.int64()), ("start_time", timestamp), ("end_time", timestamp),
+            ("duration_seconds", pa.int64()), ("distance_m", pa.float64()),
+            ("avg_speed_m_s", pa.float64()), ("max_speed_m_s", pa.float64()),
+            ("unsafe_events", pa.int64()), ("created_at", timestamp),
+        ])
+    return pa.schema([
+        ("trip_id", pa.int64()), ("id", pa.int64()), ("event_type", pa.string()),
+        ("timestamp", timestamp), ("lat", pa.float64()), ("lon", pa.float64()),
+        ("speed_m_s", pa.float64()), ("accel_m_s2", pa.float64()),
+    ])
+
+
+async def write_file(db: AsyncSession, kind: str, fmt: str, query: Select,
+                     path: str, batch_size: int) -> int:
+    rows_written = 0
+    if fmt == "parquet":
+        schema = _parquet_schema(kind)
+        with pq.ParquetWriter(path, schema) as writer:
+            async for rows in iter_partitions(db, query, batch_size):
+                columns = list(zip(*rows))
+                writer.write_table(pa.table(
+                    {name: list(values) for name, values in zip(schema.names, columns)},
+                    schema=schema,
+                ))
+                rows_written += len(rows)
+        return rows_written
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns_for(kind))
+        async for rows in iter_partitions(db, query, batch_size):
+            writer.writerows(_csv_rows(rows))
+            rows_written += len(rows)
+    return rows_written
+
+
+class ExportJobStore:
+    """Export jobs as ``<id>.json`` status files plus ``<id>.<format>`` output.
+
+    Files untouched for ``retention_seconds`` are deleted whenever a new
+    job is created. A running job touches its status file every third of
+    ``stale_seconds``; an unfinished job whose file is older than that lost
+    its worker and is reported as failed when loaded.
+    """
+
+    def __init__(self, directory: str, retention_seconds: Optional[float] = None,
+                 stale_seconds: Optional[float] = None):
+        self.directory = directory
+        self.retention_seconds = retention_seconds
+        self.stale_seconds = stale_seconds
+
+    def _status_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def output_path(self, job: Dict[str, Any]) -> str:
+        return os.path.join(self.directory, f"{job['id']}.{job['format']}")
+
+    def create(self, user_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        os.makedirs(self.directory, exist_ok=True)
+        if self.retention_seconds is not None:
+            self.purge(time.time() - self.retention_seconds)
+        job = dict(
+            params,
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            status="pending",
+            rows=None,
+            error=None,
+            created_at=_now(),
+            finished_at=None,
+        )
+        self.save(job)
+        return job
+
+    def save(self, job: Dict[str, Any]) -> None:
+        path = self._status_path(job["id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, default=str)
+        os.replace(tmp_path, path)
+
+    def purge(self, before: float) -> int:
+        """Delete job files last modified before the ``before`` epoch time."""
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < before:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass  # removed by another worker
+        return removed
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        path = self._status_path(job_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                job = json.load(f)
+            modified = os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+        
+        if (self.stale_seconds is not None and job["status"] in ("pending", "running")
+                and time.time() - modified > self.stale_seconds):
+            job["status"] = "failed"
+            job["error"] = "Export was interrupted"
+            job["finished_at"] = _now()
+            self.save(job)
+        return job
+
+    async def _heartbeat(self, job_id: str, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                os.utime(self._status_path(job_id))
+            except FileNotFoundError:
+                return
+
+    async def run(self, job: Dict[str, Any], session_factory: async_sessionmaker, batch_size: int) -> None:
+        job["status"] = "running"
+        self.save(job)
+        heartbeat = None
+        if self.stale_seconds is not None:
+            heartbeat = asyncio.create_task(self._heartbeat(job["id"], self.stale_seconds / 3))
+        try:
+            query = build_query(
+                job["kind"],
+                job["user_id"],
+                start=_parse(job.get("start")),
+                end=_parse(job.get("end")),
+                event_types=job.get("event_types"),
+            )
+            async with session_factory() as db:
+                job["rows"] = await write_file(
+                    db, job["kind"], job["format"], query, self.output_path(job), batch_size
+                )
+            job["status"] = "completed"
+        except Exception as e:
+            logger.exception("Export job %s failed", job["id"])
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            job["finished_at"] = _now()
+            self.save(job)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    # Accepts the trailing "Z" that fromisoformat rejects before Python 3.11
+    return _DATETIME.validate_python(value) if value else None
@@ -0,0 +1,182 @@
+"""Fleet-wide driver rankings from incrementally maintained aggregates.
+
+Every upload folds its trip into one ``DriverDailyStats`` row, so period
+queries read drivers x days rows instead of every trip and event.
+"""
+import math
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Mapping
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.fleet import DriverDailyStats
+from app.models.trip import Trip
+from app.models.user import User
+from app.services.sketch import QuantileSketch
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def unsafe_per_100km(unsafe_events: float, distance_m: float) -> float:
+    return unsafe_events / distance_m * 100_000 if distance_m else 0.0
+
+
+async def record_trip(db: AsyncSession, trip: Trip, event_counts: Mapping[str, int]) -> None:
+    """Fold a newly stored trip into its driver's daily aggregate.
+
+    Runs inside the caller's transaction; the row lock serialises
+    concurrent uploads for the same driver and day.
+    """
+    start = trip.start_time or datetime.now(timezone.utc)
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc)
+    day = start.date()
+
+    await db.execute(
+        pg_insert(DriverDailyStats)
+        .values(
+            user_id=trip.user_id, day=day, trip_count=0, distance_m=0,
+            duration_seconds=0, unsafe_events=0, event_counts={},
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "day"])
+    )
+    result = await db.execute(
+        select(DriverDailyStats)
+        .where(DriverDailyStats.user_id == trip.user_id, DriverDailyStats.day == day)
+        .with_for_update()
+    )
+    stats = result.scalar_one()
+
+    stats.trip_count += 1
+    stats.distance_m += trip.distance_m or 0
+    stats.duration_seconds += trip.duration_seconds or 0
+    stats.unsafe_events += trip.unsafe_events or 0
+
+    counts = dict(stats.event_counts or {})
+    for event_type, count in event_counts.items():
+        counts[event_type] = counts.get(event_type, 0) + int(count)
+    stats.event_counts = counts
+
+    # Uploads are validated, but a bad rate must not fail the whole trip
+    rate = unsafe_per_100km(trip.unsafe_events or 0, trip.distance_m or 0)
+    if trip.distance_m and math.isfinite(rate) and rate >= 0:
+        sketch = QuantileSketch.from_dict(stats.rate_sketch)
+        sketch.add(rate)
+        stats.rate_sketch = sketch.to_dict()
+
+
+async def leaderboard(
+    db: AsyncSession,
+    since: date,
+    limit: int,
+    riskiest: bool,
+    min_distance_m: float,
+) -> List[Dict[str, Any]]:
+    distance = func.sum(DriverDailyStats.distance_m)
+    unsafe = func.sum(DriverDailyStats.unsafe_events)
+    rate = unsafe * 100_000.0 / func.nullif(distance, 0)
+
+    # Top-K is resolved by the database over the per-day aggregates
+    result = await db.execute(
+        select(
+            DriverDailyStats.user_id,
+            User.name,
+            func.sum(DriverDailyStats.trip_count).label("trips"),
+            distance.label("distance_m"),
+            func.sum(DriverDailyStats.duration_seconds).label("duration_seconds"),
+            unsafe.label("unsafe_events"),
+            rate.label("rate"),
+        )
+        .join(User, User.id == DriverDailyStats.user_id)
+        .where(DriverDailyStats.day >= since)
+        .group_by(DriverDailyStats.user_id, User.name)
+        .having(distance >= min_distance_m)
+        .order_by(rate.desc() if riskiest else rate.asc(), distance.desc())
+        .limit(limit)
+    )
+    rows = result.all()
+
+    mix = await _event_mix(db, since, [row.user_id for row in rows])
+
+    return [
+        {
+            "rank": rank,
+            "user_id": row.user_id,
+            "name": row.name,
+            "trips": row.trips,
+            "distance_km": round(row.distance_m / 1000, 2),
+            "duration_hours": round(row.duration_seconds / 3600, 2),
+            "unsafe_events": row.unsafe_events,
+            "unsafe_per_100km": round(row.rate or 0, 2),
+            "event_mix": mix.get(row.user_id, {}),
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+async def cohort(db: AsyncSession, since: date) -> Dict[str, Any]:
+    result = await db.execute(
+        select(
+            DriverDailyStats.user_id,
+            DriverDailyStats.trip_count,
+            DriverDailyStats.distance_m,
+            DriverDailyStats.unsafe_events,
+            DriverDailyStats.event_counts,
+            DriverDailyStats.rate_sketch,
+        )
+        .where(DriverDailyStats.day >= since)
+    )
+
+    drivers = set()
+    trips = 0
+    distance_m = 0.0
+    unsafe_events = 0
+    event_counts: Dict[str, int] = {}
+    sketch = QuantileSketch()
+    for row in result:
+        drivers.add(row.user_id)
+        trips += row.trip_count
+        distance_m += row.distance_m
+        unsafe_events += row.unsafe_events
+        _add_counts(event_counts, row.event_counts)
+        if row.rate_sketch:
+            sketch.merge(QuantileSketch.from_dict(row.rate_sketch))
+
+    total_events = sum(event_counts.values())
+    return {
+        "since": since.isoformat(),
+        "drivers": len(drivers),
+        "trips": trips,
+        "distance_km": round(distance_m / 1000, 2),
+        "unsafe_events": unsafe_events,
+        "unsafe_per_100km": round(unsafe_per_100km(unsafe_events, distance_m), 2),
+        "event_mix": {
+            event_type: {"count": count, "share": round(count / total_events, 4)}
+            for event_type, count in sorted(event_counts.items())
+        },
+        "trip_unsafe_per_100km_percentiles": {
+            f"p{int(q * 100)}": _round(sketch.quantile(q)) for q in PERCENTILES
+        },
+    }
+
+
+async def _event_mix(db: AsyncSession, since: date, user_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    if not user_ids:
+        return {}
+    result = await db.execute(
+        select(DriverDailyStats.user_id, DriverDailyStats.event_counts)
+        .where(DriverDailyStats.day >= since, DriverDailyStats.user_id.in_(user_ids))
+    )
+    mix: Dict[int, Dict[str, int]] = {}
+    for user_id, counts in result:
+        _add_counts(mix.setdefault(user_id, {}), counts)
+    return mix
+
+
+def _add_counts(total: Dict[str, int], counts: Mapping[str, int]) -> None:
+    for event_type, count in (counts or {}).items():
+        total[event_type] = total.get(event_type, 0) + count
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
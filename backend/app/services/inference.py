@@ -0,0 +1,116 @@
+"""Traffic sign inference, isolated from API startup.
+
+Nothing from the ML stack is imported until the first prediction, so
+workers that never serve ``predict_sign`` never pay for TensorFlow. With
+``INFERENCE_MODE="process"`` the model lives in spawned child processes
+and the API worker only exchanges image bytes with them, keeping
+TensorFlow's memory and GIL out of the serving process.
+
+The pool belongs to one API worker. Under gunicorn with N workers that
+is up to N * ``INFERENCE_WORKERS`` model processes, each spawned on that
+worker's first prediction; it isolates the model, it does not share it.
+"""
+import asyncio
+import importlib.util
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from app.core.config import settings
+
+LABELS = [
+    'speed_limit_30',
+    'speed_limit_50',
+    'speed_limit_60',
+    'speed_limit_80',
+    'speed_limit_100',
+    'speed_limit_120',
+    'stop',
+    'yield',
+    'no_entry',
+]
+
+INPUT_SIZE = (224, 224)
+
+_classifier = None
+_classifier_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def is_available() -> bool:
+    """Check the ML packages are installed without importing them."""
+    return all(
+        importlib.util.find_spec(name) is not None
+        for name in ("tensorflow", "numpy", "PIL")
+    )
+
+
+class SignClassifier:
+    def __init__(self, model_path: Optional[str] = None):
+        import tensorflow as tf
+
+        self.model = tf.keras.models.load_model(model_path) if model_path else None
+
+    def predict(self, image_bytes: bytes) -> Dict[str, Any]:
+        import io
+        import numpy as np
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(image_bytes)).convert('RGB').resize(INPUT_SIZE)
+        img_array = np.array(image) / 255.0
+        img_array = np.expand_dims(img_array, axis=0).astype(np.float32)
+
+        if self.model is not None:
+            predictions = self.model.predict(img_array, verbose=0)
+        else:
+            # Dummy model prediction until a trained model is configured
+            predictions = np.random.rand(1, len(LABELS))
+        predicted_class_idx = int(np.argmax(predictions[0]))
+        confidence = predictions[0][predicted_class_idx]
+
+        return {
+            "class": LABELS[predicted_class_idx],
+            "confidence": float(confidence),
+            "bbox": [0.1, 0.1, 0.9, 0.9]  # Dummy bbox
+        }
+
+
+def _load_classifier(model_path: Optional[str]) -> SignClassifier:
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = SignClassifier(model_path)
+    return _classifier
+
+
+def _predict(image_bytes: bytes, model_path: Optional[str]) -> Dict[str, Any]:
+    return _load_classifier(model_path).predict(image_bytes)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: the child must not inherit the event loop or DB pool
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.INFERENCE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_load_classifier,
+            initargs=(settings.SIGN_MODEL_PATH,),
+        )
+    return _executor
+
+
+async def predict(image_bytes: bytes) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    if settings.INFERENCE_MODE == "process":
+        executor = _get_executor()
+    else:
+        executor = None  # default thread pool, keeps the event loop free
+    return await loop.run_in_executor(executor, _predict, image_bytes, settings.SIGN_MODEL_PATH)
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
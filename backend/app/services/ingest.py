@@ -0,0 +1,52 @@
+"""Derived data computed once when a trip's rows have been written."""
+from typing import Any, Dict, List, Mapping
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.trip import Trip, SignDetection, SignDetectionRaw
+from app.services import compliance, fleet, signs
+
+RAW_SIGN_FIELDS = ("ts", "class_name", "confidence", "bbox")
+
+
+async def store_sign_detections(db: AsyncSession, trip_id: int, rows: List[Dict[str, Any]]) -> None:
+    """Insert per-frame detections as one row per sign, optionally keeping the frames."""
+    clusters = signs.cluster_detections(
+        rows,
+        window_s=settings.SIGN_CLUSTER_WINDOW_SECONDS,
+        min_iou=settings.SIGN_CLUSTER_MIN_IOU,
+    )
+    if not clusters:
+        return
+    members = [cluster.pop("members") for cluster in clusters]
+    records = [dict(cluster, trip_id=trip_id) for cluster in clusters]
+
+    if not settings.SIGN_DETECTIONS_KEEP_RAW:
+        await db.execute(insert(SignDetection), records)
+        return
+
+    result = await db.execute(
+        insert(SignDetection).returning(SignDetection.id, sort_by_parameter_order=True),
+        records
+    )
+    await db.execute(
+        insert(SignDetectionRaw),
+        [
+            dict({key: rows[i].get(key) for key in RAW_SIGN_FIELDS}, trip_id=trip_id, sign_detection_id=sign_id)
+            for sign_id, indices in zip(result.scalars().all(), members)
+            for i in indices
+        ]
+    )
+
+
+async def finalize_trip(db: AsyncSession, trip: Trip, event_counts: Mapping[str, int]) -> None:
+    """Run inside the transaction that stored the trip, before commit."""
+    await db.flush()
+    await fleet.record_trip(db, trip, event_counts)
+    await compliance.record_trip(
+        db,
+        trip.id,
+        min_confidence=settings.SPEED_SIGN_MIN_CONFIDENCE,
+        tolerance_kmh=settings.SPEED_LIMIT_TOLERANCE_KMH,
+        max_gap_s=settings.SPEED_COMPLIANCE_MAX_GAP_SECONDS,
+    )
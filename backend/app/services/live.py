@@ -0,0 +1,182 @@
+"""Incrementally uploaded trips.
+
+A ``LiveTripSession`` owns a provisional ``Trip`` row, buffers incoming
+events, writes them to ``trip_events`` in batches and, on close, replaces
+the provisional summary with the final one.
+"""
+import asyncio
+import logging
+import math
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models.trip import Trip, TripEvent
+from app.schemas.trip import TripEventCreate, SignDetectionCreate
+from app.services import ingest, simplify, wire
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_000.0
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class LiveTripSession:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        trip_id: int,
+        user_id: int,
+        start_time: datetime,
+        batch_size: int,
+        flush_interval: float,
+    ):
+        self.session_factory = session_factory
+        self.trip_id = trip_id
+        self.user_id = user_id
+        self.start_time = start_time
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._events: List[Dict[str, Any]] = []
+        self._signs: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+        self.event_count = 0
+        self.event_counts: Counter = Counter()
+        self.speed_sum = 0.0
+        self.max_speed = 0.0
+        self.distance_m = 0.0
+        self.last_timestamp: Optional[datetime] = None
+        self._last_point = None
+
+    @classmethod
+    async def open(cls, session_factory: async_sessionmaker, user_id: int,
+                   batch_size: int, flush_interval: float) -> "LiveTripSession":
+        start_time = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            # Provisional summary so the trip is valid in listings while live
+            trip = Trip(
+                user_id=user_id, start_time=start_time, end_time=start_time,
+                duration_seconds=0, distance_m=0, avg_speed_m_s=0,
+                max_speed_m_s=0, unsafe_events=0,
+            )
+            db.add(trip)
+            await db.commit()
+            trip_id = trip.id
+
+        session = cls(session_factory, trip_id, user_id, start_time, batch_size, flush_interval)
+        session._flusher = asyncio.create_task(session._flush_periodically())
+        return session
+
+    async def add_event(self, event: TripEventCreate) -> None:
+        row = event.model_dump()
+        self._events.append(dict(row, trip_id=self.trip_id))
+
+        self.event_count += 1
+        self.event_counts[event.event_type] += 1
+        self.speed_sum += event.speed_m_s
+        self.max_speed = max(self.max_speed, event.speed_m_s)
+        if self._last_point is not None:
+            self.distance_m += haversine_m(*self._last_point, event.lat, event.lon)
+        self._last_point = (event.lat, event.lon)
+        timestamp = _as_utc(event.timestamp)
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        if len(self._events) >= self.batch_size:
+            await self.flush()
+
+    def add_sign(self, sign: SignDetectionCreate) -> None:
+        self._signs.append(dict(sign.model_dump(), trip_id=self.trip_id))
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._events:
+                return
+            rows, self._events = self._events, []
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(insert(TripEvent), rows)
+                    await db.commit()
+            except BaseException:
+                # Keep the batch, ahead of anything buffered meanwhile, for the next flush
+                self._events = rows + self._events
+                raise
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Periodic flush of live trip %s failed, retrying", self.trip_id)
+
+    async def close(self, summary: Optional[Dict[str, Any]] = None) -> Trip:
+        """Persist what is buffered and turn the provisional row into a normal trip."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+        summary = {key: value for key, value in (summary or {}).items() if value is not None}
+        end_time = _as_utc(summary.get("end_time") or self.last_timestamp or datetime.now(timezone.utc))
+
+        async with self.session_factory() as db:
+            result = await db.execute(select(Trip).where(Trip.id == self.trip_id))
+            trip = result.scalar_one()
+
+            trip.end_time = end_time
+            trip.duration_seconds = summary.get(
+                "duration_seconds", max(0, int((end_time - self.start_time).total_seconds()))
+            )
+            trip.distance_m = summary.get("distance_m", self.distance_m)
+            trip.avg_speed_m_s = summary.get(
+                "avg_speed_m_s", self.speed_sum / self.event_count if self.event_count else 0
+            )
+            trip.max_speed_m_s = summary.get("max_speed_m_s", self.max_speed)
+            trip.unsafe_events = summary.get("unsafe_events", self.event_count)
+
+            await ingest.store_sign_detections(db, self.trip_id, self._signs)
+            self._signs = []
+
+            await self._store_route_tolerances(db)
+
+            await ingest.finalize_trip(db, trip, self.event_counts)
+            await db.commit()
+
+        return trip
+
+    async def _store_route_tolerances(self, db: AsyncSession) -> None:
+        # Events were written in batches, so the route is simplified once at the end
+        result = await db.execute(
+            select(TripEvent.id, TripEvent.timestamp, TripEvent.lat, TripEvent.lon)
+            .where(TripEvent.trip_id == self.trip_id)
+        )
+        rows = result.all()
+        if not rows:
+            return
+        ids, timestamps, lats, lons = zip(*rows)
+        tolerances = simplify.route_tolerances(
+            wire.to_epoch(timestamps),
+            np.array(lats, dtype=np.float64),
+            np.array(lons, dtype=np.float64),
+        )
+        await db.execute(
+            update(TripEvent),
+            [{"id": id_, "route_tolerance_m": tolerance} for id_, tolerance in zip(ids, tolerances.tolist())]
+        )
@@ -0,0 +1,96 @@
+"""Fan-out of live driver events.
+
+Publishing never waits on subscribers. Each subscriber has a bounded
+queue; when a slow consumer falls behind, its oldest messages are dropped
+and counted so the consumer can report the gap.
+
+Messages travel through a ``LiveBackend``. The default one delivers inside
+the publishing process only, so a watcher and the driver must be served
+by the same worker; a broker-backed subclass lifts that restriction.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, message: Any) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class LiveBackend(ABC):
+    """Carries published messages to every process with subscribers."""
+
+    # Whether messages reach subscribers in other processes
+    cross_process = False
+
+    def attach(self, deliver: Callable[[int, Any], None]) -> None:
+        self.deliver = deliver
+
+    @abstractmethod
+    def publish(self, channel: int, message: Any) -> None:
+        """Hand ``message`` to ``deliver`` in each subscribed process, this one included.
+
+        Must not block; a network backend queues the send.
+        """
+
+    def subscribed(self, channel: int) -> None:
+        """First local subscriber of ``channel`` appeared."""
+
+    def unsubscribed(self, channel: int) -> None:
+        """Last local subscriber of ``channel`` left."""
+
+
+class InProcessBackend(LiveBackend):
+    def publish(self, channel: int, message: Any) -> None:
+        self.deliver(channel, message)
+
+
+class LiveHub:
+    def __init__(self, queue_size: int = 256, backend: Optional[LiveBackend] = None):
+        self.queue_size = queue_size
+        self.backend = backend or InProcessBackend()
+        self.backend.attach(self._deliver)
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+
+    def subscriber_count(self, channel: int) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    def publish(self, channel: int, message: Any) -> None:
+        self.backend.publish(channel, message)
+
+    def _deliver(self, channel: int, message: Any) -> None:
+        for subscription in tuple(self._subscribers.get(channel, ())):
+            subscription.offer(message)
+
+    @contextmanager
+    def subscribe(self, channel: int) -> Iterator[Subscription]:
+        subscription = Subscription(self.queue_size)
+        if channel not in self._subscribers:
+            self._subscribers[channel] = set()
+            self.backend.subscribed(channel)
+        self._subscribers[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+                    self.backend.unsubscribed(channel)
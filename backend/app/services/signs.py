@@ -0,0 +1,139 @@
+"""Temporal clustering of per-frame sign detections.
+
+A detector running on every frame reports the same physical sign many
+times in a row, often alongside other signs of the same class. Detections
+are walked in class and time order and greedily assigned to tracks: each
+one joins the open same-class track whose latest member is at most
+``window_s`` earlier and overlaps it best, by at least ``min_iou``, or
+starts a new track. Each track becomes one row.
+"""
+from typing import Any, Dict, List, Mapping, Optional
+import numpy as np
+from app.services import wire
+
+
+def bbox_array(bboxes: List[Optional[Mapping[str, Any]]]) -> np.ndarray:
+    """(n, 4) array of x1, y1, x2, y2; NaN where a box can't be read.
+
+    Accepts corner keys (``x1``/``y1``/``x2``/``y2``) or an origin with a
+    size (``x``/``y`` with ``w``/``h`` or ``width``/``height``).
+    """
+    boxes = np.full((len(bboxes), 4), np.nan)
+    for i, bbox in enumerate(bboxes):
+        if not isinstance(bbox, Mapping):
+            continue
+        try:
+            if "x1" in bbox:
+                boxes[i] = [bbox["x1"], bbox["y1"], bbox["x2"], bbox["y2"]]
+            elif "x" in bbox:
+                x, y = float(bbox["x"]), float(bbox["y"])
+                w = float(bbox["w"] if "w" in bbox else bbox["width"])
+                h = float(bbox["h"] if "h" in bbox else bbox["height"])
+                boxes[i] = [x, y, x + w, y + h]
+        except (KeyError, TypeError, ValueError):
+            boxes[i] = np.nan
+    return boxes
+
+
+def pairwise_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise IoU of two (n, 4) box arrays, NaN where either box is unknown."""
+    width = np.clip(np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0]), 0, None)
+    height = np.clip(np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1]), 0, None)
+    intersection = width * height
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a + area_b - intersection
+    with np.errstate(invalid="ignore", divide="ignore"):
+        iou = np.where(union > 0, intersection / union, 0.0)
+    iou[np.isnan(a).any(axis=1) | np.isnan(b).any(axis=1)] = np.nan
+    return iou
+
+
+def cluster_detections(rows: List[Dict[str, Any]], window_s: float,
+                       min_iou: float) -> List[Dict[str, Any]]:
+    """Merge repeated detections of the same sign into one row each.
+
+    Each returned row carries the first ``ts``, ``last_ts``,
+    ``detection_count``, the highest ``confidence`` with that detection's
+    ``bbox``, ``mean_confidence`` and ``members``, the input indices it
+    was built from. Rows are ordered by ``ts``. Pairs where either box
+    can't be read are linked on time alone.
+    """
+    n = len(rows)
+    if n == 0:
+        return []
+
+    ts = wire.to_epoch([row["ts"] for row in rows])
+    _, class_codes = np.unique([row["class_name"] for row in rows], return_inverse=True)
+    confidence = np.array([row["confidence"] for row in rows], dtype=np.float64)
+    boxes = bbox_array([row.get("bbox") for row in rows])
+
+    order = np.lexsort((ts, class_codes))
+    labels = _assign_tracks(order, ts, class_codes, boxes, window_s, min_iou)
+    # Input indices grouped by track, in time order within each track
+    order = order[np.argsort(labels[order], kind="stable")]
+    ts_sorted = ts[order]
+    conf_sorted = confidence[order]
+
+    counts = np.bincount(labels)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+
+    max_conf = np.maximum.reduceat(conf_sorted, starts)
+    mean_conf = np.add.reduceat(conf_sorted, starts) / counts
+    # Highest confidence first within each cluster, so its first slot is the best detection
+    cluster_ids = np.repeat(np.arange(len(starts)), counts)
+    best = order[np.lexsort((-conf_sorted, cluster_ids))[starts]]
+    first = order[starts]
+    last = order[ends - 1]
+
+    clusters = []
+    for i in np.argsort(ts_sorted[starts], kind="stable").tolist():
+        clusters.append({
+            "ts": rows[first[i]]["ts"],
+            "last_ts": rows[last[i]]["ts"],
+            "class_name": rows[first[i]]["class_name"],
+            "confidence": float(max_conf[i]),
+            "mean_confidence": float(mean_conf[i]),
+            "detection_count": int(counts[i]),
+            "bbox": rows[best[i]].get("bbox"),
+            "members": order[starts[i]:ends[i]].tolist(),
+        })
+    return clusters
+
+
+def _assign_tracks(order: np.ndarray, ts: np.ndarray, class_codes: np.ndarray,
+                   boxes: np.ndarray, window_s: float, min_iou: float) -> np.ndarray:
+    """Track number of each detection, assigned greedily in ``order``."""
+    labels = np.empty(len(order), dtype=np.intp)
+    tails: List[int] = []  # latest member of each track
+    open_tracks: List[int] = []
+    current_class = None
+    for i in order.tolist():
+        if class_codes[i] != current_class:
+            current_class = class_codes[i]
+            open_tracks = []
+        open_tracks = [t for t in open_tracks if ts[i] - ts[tails[t]] <= window_s]
+        # Two detections in the same frame are different signs
+        candidates = [t for t in open_tracks if ts[tails[t]] < ts[i]]
+
+        track = None
+        if candidates:
+            members = np.array([tails[t] for t in candidates])
+            iou = pairwise_iou(np.repeat(boxes[i:i + 1], len(members), axis=0), boxes[members])
+            overlapping = np.flatnonzero(iou >= min_iou)
+            unknown = np.flatnonzero(np.isnan(iou))
+            if overlapping.size:
+                track = candidates[overlapping[np.argmax(iou[overlapping])]]
+            elif unknown.size:
+                # Without both boxes, link on time alone to the most recent track
+                track = candidates[unknown[np.argmax(ts[members[unknown]])]]
+
+        if track is None:
+            track = len(tails)
+            tails.append(i)
+            open_tracks.append(track)
+        else:
+            tails[track] = i
+        labels[i] = track
+    return labels
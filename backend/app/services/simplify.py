@@ -0,0 +1,111 @@
+"""Multi-resolution route simplification.
+
+A single Douglas-Peucker pass assigns each point the largest tolerance at
+which it survives: the distance that selected it, capped by the value of
+the point that split its parent segment. Keeping points whose value is
+above ``eps`` reproduces Douglas-Peucker at ``eps`` exactly, so one
+stored float per point serves every zoom level.
+"""
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_000.0
+
+# Named levels for the API, in metres of allowed deviation
+RESOLUTION_TOLERANCES_M = {
+    "full": 0.0,
+    "high": 5.0,
+    "medium": 25.0,
+    "low": 100.0,
+}
+
+
+def project(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Equirectangular projection to metres around the route's mean latitude."""
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    x = EARTH_RADIUS_M * lon_rad * np.cos(np.mean(lat_rad))
+    y = EARTH_RADIUS_M * lat_rad
+    return np.column_stack([x, y])
+
+
+def douglas_peucker_tolerances(points: np.ndarray) -> np.ndarray:
+    """Tolerance per point for an ordered (n, 2) array of metric coordinates.
+
+    All open segments of one recursion depth are processed together, so
+    the number of NumPy calls grows with the depth, not the point count.
+    """
+    n = len(points)
+    tolerances = np.full(n, np.inf)
+    if n < 3:
+        return tolerances
+
+    first = np.array([0])
+    last = np.array([n - 1])
+    parent = np.array([np.inf])
+    while True:
+        counts = last - first - 1
+        open_ = counts > 0
+        first, last, parent, counts = first[open_], last[open_], parent[open_], counts[open_]
+        if not len(first):
+            return tolerances
+
+        # Interior point indices of every segment, laid out segment by segment
+        starts = np.cumsum(counts) - counts
+        segment = np.repeat(np.arange(len(first)), counts)
+        index = first[segment] + 1 + np.arange(counts.sum()) - starts[segment]
+
+        a = points[first][segment]
+        ab = points[last][segment] - a
+        ap = points[index] - a
+        length_sq = np.einsum("ij,ij->i", ab, ab)
+        t = np.clip(
+            np.einsum("ij,ij->i", ap, ab) / np.where(length_sq > 0, length_sq, 1.0), 0.0, 1.0
+        )
+        distances = np.hypot(*(ap - t[:, None] * ab).T)
+
+        # First maximum of each segment, as np.argmax would pick
+        segment_max = np.maximum.reduceat(distances, starts)
+        candidates = np.flatnonzero(distances == segment_max[segment])
+        _, first_candidate = np.unique(segment[candidates], return_index=True)
+        split = index[candidates[first_candidate]]
+
+        value = np.minimum(segment_max, parent)
+        tolerances[split] = value
+
+        # Interior points exactly on their segment can never be kept; closing
+        # such segments at once avoids one level per point on straight runs
+        flat = segment_max == 0
+        tolerances[index[flat[segment]]] = 0.0
+        split, value = split[~flat], value[~flat]
+        first, last = first[~flat], last[~flat]
+        first, last, parent = (
+            np.concatenate([first, split]),
+            np.concatenate([split, last]),
+            np.concatenate([value, value]),
+        )
+
+
+def route_tolerances(timestamps: np.ndarray, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Per-point tolerance in metres, in the input order.
+
+    Points are ordered by time first; points without coordinates are
+    always kept.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+
+    tolerances = np.full(len(lat), np.inf)
+    valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+    if len(valid) < 3:
+        return tolerances
+
+    order = valid[np.argsort(np.nan_to_num(timestamps[valid], nan=np.inf), kind="stable")]
+    tolerances[order] = douglas_peucker_tolerances(project(lat[order], lon[order]))
+    return tolerances
+
+
+def keep_mask(tolerances: np.ndarray, epsilon: float) -> np.ndarray:
+    if epsilon <= 0:
+        return np.ones(len(tolerances), dtype=bool)
+    return np.asarray(tolerances) > epsilon
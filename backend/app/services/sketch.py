@@ -0,0 +1,73 @@
+"""Mergeable quantile sketch with relative-error guarantees.
+
+Values are counted in logarithmically sized buckets (the DDSketch
+scheme), so any quantile is returned within ``relative_accuracy`` of the
+true value, two sketches merge by adding bucket counts and the state
+serialises to a small JSON object.
+"""
+import math
+from typing import Any, Dict, Iterable, Optional
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.zeros = 0
+        self.bins: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        return self.zeros + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < 0 or math.isnan(value):
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        if value == 0:
+            self.zeros += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+
+    def update(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.zeros += other.zeros
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zeros": self.zeros,
+            "bins": {str(key): count for key, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "QuantileSketch":
+        if not data:
+            return cls()
+        sketch = cls(data.get("relative_accuracy", 0.01))
+        sketch.zeros = data.get("zeros", 0)
+        sketch.bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        return sketch
@@ -0,0 +1,214 @@
+"""Packed binary trip encoding.
+
+A trip is a MessagePack map whose scalar fields mirror ``TripCreate`` and
+whose ``events`` entry holds one little-endian typed array per column::
+
+    {
+        "start_time": 1714550400.0,          # epoch seconds
+        ...
+        "events": {
+            "event_types": ["hard_brake", ...],  # code table
+            "type_code": <bin u1[n]>,
+            "timestamp": <bin f8[n]>,          # epoch seconds
+            "lat": <bin f8[n]>, "lon": <bin f8[n]>,
+            "speed_m_s": <bin f4[n]>, "accel_m_s2": <bin f4[n]>,
+        },
+        "sign_detections": [{"ts": 1714550401.5, "class_name": ..., ...}],
+    }
+
+Columns are exposed as NumPy views over the received buffer, no per-event
+objects are created while decoding.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import msgpack
+import numpy as np
+from pydantic import ValidationError
+from app.schemas.trip import TripSummary
+
+MEDIA_TYPE = "application/x-msgpack"
+
+EVENT_COLUMNS = {
+    "type_code": np.dtype("<u1"),
+    "timestamp": np.dtype("<f8"),
+    "lat": np.dtype("<f8"),
+    "lon": np.dtype("<f8"),
+    "speed_m_s": np.dtype("<f4"),
+    "accel_m_s2": np.dtype("<f4"),
+}
+
+class WireFormatError(ValueError):
+    pass
+
+
+class EventColumns:
+    def __init__(self, event_types: List[str], columns: Dict[str, np.ndarray]):
+        self.event_types = event_types
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    @property
+    def event_type(self) -> np.ndarray:
+        return np.asarray(self.event_types, dtype=object)[self.columns["type_code"]]
+
+    def type_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        per_code = np.bincount(self.columns["type_code"], minlength=len(self.event_types))
+        for name, count in zip(self.event_types, per_code.tolist()):
+            if count:
+                counts[name] = counts.get(name, 0) + count
+        return counts
+
+    def rows(self, trip_id: int) -> List[Dict[str, Any]]:
+        """Rows for a bulk ``insert(TripEvent)``."""
+        c = self.columns
+        return [
+            {
+                "trip_id": trip_id,
+                "event_type": event_type,
+                "timestamp": _to_datetime(ts),
+                "lat": lat,
+                "lon": lon,
+                "speed_m_s": speed,
+                "accel_m_s2": accel,
+            }
+            for event_type, ts, lat, lon, speed, accel in zip(
+                self.event_type.tolist(),
+                c["timestamp"].tolist(),
+                c["lat"].tolist(),
+                c["lon"].tolist(),
+                c["speed_m_s"].tolist(),
+                c["accel_m_s2"].tolist(),
+            )
+        ]
+
+
+class PackedTrip:
+    def __init__(self, fields: Dict[str, Any], events: EventColumns,
+                 sign_detections: List[Dict[str, Any]]):
+        self.fields = fields
+        self.events = events
+        self.sign_detections = sign_detections
+
+
+def decode_trip(body: bytes) -> PackedTrip:
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as e:
+        raise WireFormatError(f"Invalid MessagePack body: {e}")
+    if not isinstance(payload, dict):
+        raise WireFormatError("Trip payload must be a map")
+
+    try:
+        fields = dict(
+            {name: payload[name] for name in TripSummary.model_fields},
+            start_time=_to_datetime(payload["start_time"]),
+            end_time=_to_datetime(payload["end_time"]),
+        )
+    except KeyError as e:
+        raise WireFormatError(f"Missing field: {e.args[0]}")
+    except (TypeError, ValueError, OverflowError) as e:
+        raise WireFormatError(f"Invalid timestamp: {e}")
+    try:
+        fields = TripSummary.model_validate(fields).model_dump()
+    except ValidationError as e:
+        raise WireFormatError(f"Invalid trip fields: {e.errors(include_url=False)}")
+
+    packed_events = payload.get("events") or {}
+    if not isinstance(packed_events, dict):
+        raise WireFormatError("'events' must be a map")
+    events = _decode_events(packed_events)
+
+    sign_detections = payload.get("sign_detections") or []
+    if not isinstance(sign_detections, list):
+        raise WireFormatError("'sign_detections' must be an array")
+    signs = []
+    for sign in sign_detections:
+        if not isinstance(sign, dict) or not isinstance(sign.get("bbox") or {}, dict):
+            raise WireFormatError("Each sign detection must be a map with a map 'bbox'")
+        try:
+            signs.append({
+                "ts": _to_datetime(sign["ts"]),
+                "class_name": str(sign["class_name"]),
+                "confidence": float(sign["confidence"]),
+                "bbox": sign.get("bbox") or {},
+            })
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            raise WireFormatError(f"Invalid sign detection: {e}")
+
+    return PackedTrip(fields, events, signs)
+
+
+def _decode_events(packed: Dict[str, Any]) -> EventColumns:
+    event_types = packed.get("event_types") or []
+    if not isinstance(event_types, list) or not all(isinstance(name, str) for name in event_types):
+        raise WireFormatError("'event_types' must be an array of strings")
+    columns = {}
+    for name, dtype in EVENT_COLUMNS.items():
+        buf = packed.get(name, b"")
+        if not isinstance(buf, (bytes, bytearray, memoryview)):
+            raise WireFormatError(f"Column '{name}' must be binary")
+        if len(buf) % dtype.itemsize:
+            raise WireFormatError(f"Column '{name}' is not a whole number of {dtype}")
+        columns[name] = np.frombuffer(buf, dtype=dtype)
+
+    lengths = {len(col) for col in columns.values()}
+    if len(lengths) > 1:
+        raise WireFormatError("Event columns have different lengths")
+    if len(columns["type_code"]) and int(columns["type_code"].max()) >= len(event_types):
+        raise WireFormatError("Event type code outside of 'event_types'")
+    if not np.isfinite(columns["timestamp"]).all():
+        raise WireFormatError("Event timestamps must be finite")
+
+    return EventColumns(event_types, columns)
+
+
+def encode_trip(trip: Dict[str, Any], events: Dict[str, np.ndarray],
+                sign_detections: List[Dict[str, Any]]) -> bytes:
+    """Pack a stored trip.
+
+    ``events`` maps column name to array and must contain ``event_type``
+    (strings) plus the numeric columns; an ``id`` column is packed as i8.
+    """
+    event_types, codes = np.unique(
+        np.asarray(events["event_type"], dtype=object).astype(str), return_inverse=True
+    )
+    packed_events = {
+        "event_types": event_types.tolist(),
+        "type_code": codes.astype("<u1").tobytes(),
+    }
+    for name, dtype in EVENT_COLUMNS.items():
+        if name != "type_code":
+            packed_events[name] = np.asarray(events[name], dtype=dtype).tobytes()
+    if "id" in events:
+        packed_events["id"] = np.asarray(events["id"], dtype="<i8").tobytes()
+
+    payload = {key: _from_datetime(value) for key, value in trip.items()}
+    payload["events"] = packed_events
+    payload["sign_detections"] = [
+        {key: _from_datetime(value) for key, value in sign.items()}
+        for sign in sign_detections
+    ]
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def to_epoch(values: List[Optional[datetime]]) -> np.ndarray:
+    """Epoch seconds, NaN for None; naive datetimes are taken as UTC like the database does."""
+    return np.fromiter(
+        (
+            (v if v.tzinfo else v.replace(tzinfo=timezone.utc)).timestamp() if v is not None else np.nan
+            for v in values
+        ),
+        dtype=np.float64,
+        count=len(values),
+    )
+
+
+def _to_datetime(value: float) -> datetime:
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+
+def _from_datetime(value: Any) -> Any:
+    return value.timestamp() if isinstance(value, datetime) else value
@@ -0,0 +1,68 @@
+"""Bytes on the wire and codec latency for trip payloads.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_compression
+"""
+import gzip
+import json
+import time
+import zlib
+
+from benchmarks.common import make_trip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Effective uplink throughput used to turn bytes into transfer time
+LINK_BYTES_PER_S = {"3g": 1_000_000 / 8, "lte": 10_000_000 / 8}
+
+
+def _timed(fn, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def _inflate(data: bytes) -> bytes:
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    return d.decompress(data) + d.flush()
+
+
+def main() -> None:
+    header = (
+        f"{'events':>7} {'codec':>9} {'bytes':>10} {'ratio':>6} "
+        f"{'enc ms':>7} {'dec ms':>7} {'3g ms':>8} {'lte ms':>7}"
+    )
+    print(header)
+    for n_events in (100, 1_000, 10_000, 50_000):
+        raw = json.dumps(make_trip(n_events, n_events // 20)).encode()
+        codecs = [("identity", lambda: raw, lambda b: b)]
+        for level in (1, 6, 9):
+            codecs.append((
+                f"gzip-{level}",
+                lambda level=level: gzip.compress(raw, compresslevel=level),
+                _inflate,
+            ))
+        if brotli is not None:
+            codecs.append(("brotli-5", lambda: brotli.compress(raw, quality=5), brotli.decompress))
+
+        for name, encode, decode in codecs:
+            encoded, enc_s = _timed(encode)
+            _, dec_s = _timed(lambda: decode(encoded))
+            print(
+                f"{n_events:>7} {name:>9} {len(encoded):>10} "
+                f"{len(raw) / len(encoded):>6.1f} {enc_s * 1e3:>7.2f} {dec_s * 1e3:>7.2f} "
+                f"{len(encoded) / LINK_BYTES_PER_S['3g'] * 1e3:>8.1f} "
+                f"{len(encoded) / LINK_BYTES_PER_S['lte'] * 1e3:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
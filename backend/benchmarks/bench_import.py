@@ -0,0 +1,48 @@
+"""Import time and resident memory of ``main:app`` in a fresh interpreter.
+
+Needs DATABASE_URL and JWT_SECRET_KEY in the environment. Run from
+``backend/``; check out the previous revision to get the "before" row::
+
+    python -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+
+PROBE = """
+import resource, sys, time
+t0 = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - t0
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+heavy = sorted(m for m in ("tensorflow", "PIL", "matplotlib", "plotly") if m in sys.modules)
+print(f"{{elapsed * 1e3:.0f}} {{rss_kb // 1024}} {{','.join(heavy) or '-'}}")
+"""
+
+CASES = {
+    "import main": "import main",
+    "import tensorflow": "import tensorflow",
+}
+
+
+def main() -> None:
+    print(f"{'case':<18} {'ms':>8} {'max RSS MB':>11}  heavy modules loaded")
+    for name, stmt in CASES.items():
+        samples = []
+        for _ in range(3):
+            out = subprocess.run(
+                [sys.executable, "-c", PROBE.format(stmt=stmt)],
+                capture_output=True, text=True,
+            )
+            if out.returncode != 0:
+                samples = None
+                break
+            samples.append(out.stdout.split())
+        if not samples:
+            print(f"{name:<18} {'n/a':>8}")
+            continue
+        best = min(samples, key=lambda s: int(s[0]))
+        print(f"{name:<18} {best[0]:>8} {best[1]:>11}  {best[2]}")
+
+
+if __name__ == "__main__":
+    main()
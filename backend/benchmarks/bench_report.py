@@ -0,0 +1,71 @@
+"""Report serialisation: per-row ORM-style build versus the columnar path.
+
+Needs DATABASE_URL and JWT_SECRET_KEY in the environment (any value, no
+connection is made). Run from ``backend/``::
+
+    python -m benchmarks.bench_report
+"""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.api.v1.reports import REPORT_CHUNK_SIZE, _format_events
+
+TYPES = ["hard_brake", "overspeed", "harsh_accel", "unsafe_curve"]
+
+
+def _row_path(events) -> str:
+    breakdown = {}
+    for event in events:
+        breakdown[event.event_type] = breakdown.get(event.event_type, 0) + 1
+    return json.dumps({
+        "events": [
+            {
+                "type": event.event_type,
+                "timestamp": event.timestamp.isoformat() if event.timestamp else None,
+                "location": {"lat": event.lat, "lon": event.lon},
+                "speed_kmh": round(event.speed_m_s * 3.6, 2) if event.speed_m_s else 0,
+                "acceleration": round(event.accel_m_s2, 2) if event.accel_m_s2 else 0
+            }
+            for event in events
+        ],
+        "event_breakdown": breakdown,
+    })
+
+
+def _columnar_path(rows) -> str:
+    chunks = [
+        _format_events(rows[i:i + REPORT_CHUNK_SIZE])
+        for i in range(0, len(rows), REPORT_CHUNK_SIZE)
+    ]
+    return "[" + ", ".join(chunks) + "]"
+
+
+def main() -> None:
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    print(f"{'events':>7} {'per-row ms':>11} {'columnar ms':>12}")
+    for n in (1_000, 10_000, 50_000, 200_000):
+        events = [
+            SimpleNamespace(
+                event_type=TYPES[i % 4], timestamp=start + timedelta(seconds=i),
+                lat=40.0 + i * 1e-5, lon=-74.0 - i * 1e-5,
+                speed_m_s=10.0 + i % 20, accel_m_s2=-2.5 + (i % 7) * 0.731,
+            )
+            for i in range(n)
+        ]
+        rows = [
+            (e.event_type, e.timestamp.timestamp(), e.lat, e.lon, e.speed_m_s, e.accel_m_s2)
+            for e in events
+        ]
+
+        t0 = time.perf_counter()
+        _row_path(events)
+        t1 = time.perf_counter()
+        _columnar_path(rows)
+        t2 = time.perf_counter()
+        print(f"{n:>7} {(t1 - t0) * 1e3:>11.1f} {(t2 - t1) * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
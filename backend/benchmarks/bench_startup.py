@@ -0,0 +1,47 @@
+"""Cold start time until ``/health`` answers, per serving profile.
+
+Needs DATABASE_URL and JWT_SECRET_KEY in the environment. Run from
+``backend/``::
+
+    python -m benchmarks.bench_startup
+"""
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+PORT = 8765
+PROFILES = {
+    "uvicorn x1": [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT)],
+    "gunicorn x2": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+    "gunicorn x4": [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+}
+
+
+def _wait_healthy(timeout: float = 60.0) -> float:
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < timeout:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{PORT}/health", timeout=1):
+                return time.perf_counter() - t0
+        except OSError:
+            time.sleep(0.02)
+    raise TimeoutError("server did not become healthy")
+
+
+def main() -> None:
+    for name, cmd in PROFILES.items():
+        env = dict(os.environ, PORT=str(PORT), AUTO_CREATE_SCHEMA="false")
+        if name.startswith("gunicorn"):
+            env["WEB_CONCURRENCY"] = name.split("x")[-1]
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            print(f"{name:<12} ready in {_wait_healthy() * 1e3:8.1f} ms")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
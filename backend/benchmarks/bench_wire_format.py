@@ -0,0 +1,60 @@
+"""Parse time of JSON ``TripCreate`` versus the packed MessagePack format.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_wire_format
+"""
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+from app.schemas.trip import TripCreate
+from app.services import wire
+from benchmarks.common import make_trip
+
+
+def _timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _pack(trip: dict) -> bytes:
+    events = trip["events"]
+    columns = {
+        "event_type": [e["event_type"] for e in events],
+        "timestamp": np.array([datetime.fromisoformat(e["timestamp"]).timestamp() for e in events]),
+    }
+    for name in ("lat", "lon", "speed_m_s", "accel_m_s2"):
+        columns[name] = np.array([e[name] for e in events])
+    scalars = {k: v for k, v in trip.items() if k not in ("events", "sign_detections")}
+    scalars["start_time"] = datetime.fromisoformat(scalars["start_time"])
+    scalars["end_time"] = datetime.fromisoformat(scalars["end_time"])
+    signs = [dict(s, ts=datetime.fromisoformat(s["ts"])) for s in trip["sign_detections"]]
+    return wire.encode_trip(scalars, columns, signs)
+
+
+def main() -> None:
+    print(f"{'events':>7} {'json B':>10} {'packed B':>10} {'json ms':>8} {'packed ms':>9} {'+rows ms':>8}")
+    for n_events in (1_000, 10_000, 50_000, 200_000):
+        trip = make_trip(n_events, n_events // 20)
+        body_json = json.dumps(trip).encode()
+        body_packed = _pack(trip)
+
+        json_s = _timed(lambda: TripCreate.model_validate_json(body_json))
+        packed_s = _timed(lambda: wire.decode_trip(body_packed))
+        rows_s = _timed(lambda: wire.decode_trip(body_packed).events.rows(1))
+
+        print(
+            f"{n_events:>7} {len(body_json):>10} {len(body_packed):>10} "
+            f"{json_s * 1e3:>8.1f} {packed_s * 1e3:>9.2f} {rows_s * 1e3:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+EVENT_TYPES = ["hard_brake", "overspeed", "harsh_accel", "unsafe_curve"]
+SIGN_CLASSES = ["speed_limit_50", "speed_limit_60", "speed_limit_80", "stop", "yield"]
+
+
+def make_trip(n_events: int, n_signs: int = 0, seed: int = 0) -> dict:
+    """Build a ``TripCreate``-shaped payload resembling a real phone upload."""
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    lat, lon = 40.7128, -74.0060
+    events = []
+    for i in range(n_events):
+        lat += rng.uniform(-1e-4, 1e-4)
+        lon += rng.uniform(-1e-4, 1e-4)
+        events.append({
+            "event_type": rng.choice(EVENT_TYPES),
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "lat": round(lat, 7),
+            "lon": round(lon, 7),
+            "speed_m_s": round(rng.uniform(0, 35), 3),
+            "accel_m_s2": round(rng.uniform(-6, 4), 3),
+        })
+    signs = []
+    for i in range(n_signs):
+        signs.append({
+            "ts": (start + timedelta(seconds=i * 3)).isoformat(),
+            "class_name": rng.choice(SIGN_CLASSES),
+            "confidence": round(rng.uniform(0.4, 1.0), 3),
+            "bbox": {"x1": 0.1, "y1": 0.2, "x2": 0.3, "y2": 0.4},
+        })
+    end = start + timedelta(seconds=max(n_events, 1))
+    return {
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+        "duration_seconds": max(n_events, 1),
+        "distance_m": n_events * 12.5,
+        "avg_speed_m_s": 12.5,
+        "max_speed_m_s": 35.0,
+        "unsafe_events": n_events,
+        "events": events,
+        "sign_detections": signs,
+    }
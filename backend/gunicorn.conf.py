@@ -0,0 +1,111 @@
+"""Production serving profile.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Set RUN_MIGRATIONS=1 to apply Alembic migrations once in the master
+process before any worker starts, and AUTO_CREATE_SCHEMA=false so workers
+do not issue DDL of their own. That is once per instance: when scaling out
+to several instances, set RUN_MIGRATIONS=false and run ``alembic upgrade
+head`` as a separate release step so instances don't race on DDL.
+
+Workers default to the CPUs the container may use (cgroup quota included),
+capped at MAX_WORKERS (4); WEB_CONCURRENCY overrides. Every worker has its
+own pool of up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections. Set
+DB_MAX_CONNECTIONS to the connections this instance may use and, unless
+the pool settings are given explicitly, it is split evenly across workers.
+
+A database created by the old startup ``create_all`` has the initial
+schema but no ``alembic_version`` table; it is stamped at revision 001
+before upgrading. A database created by ``create_all`` from newer models
+must be stamped by hand (``alembic stamp head``) before the first deploy.
+"""
+import asyncio
+import math
+import os
+import subprocess
+import sys
+
+
+def _cpu_count() -> int:
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    # sched_getaffinity ignores container CPU limits (cgroup v2)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cores = min(cores, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cores
+
+
+def _split_connection_budget(worker_count: int) -> None:
+    budget = os.environ.get("DB_MAX_CONNECTIONS")
+    if not budget or "DB_POOL_SIZE" in os.environ or "DB_MAX_OVERFLOW" in os.environ:
+        return
+    # Workers inherit the master's environment and read these as settings
+    os.environ["DB_POOL_SIZE"] = str(max(1, int(budget) // worker_count))
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Async workers: one per core is enough to saturate the CPU
+workers = int(os.environ.get(
+    "WEB_CONCURRENCY", min(_cpu_count(), int(os.environ.get("MAX_WORKERS", "4")))
+))
+_split_connection_budget(workers)
+
+# Each worker imports the app after fork and builds its own engine and pool
+preload_app = os.environ.get("PRELOAD_APP", "false").lower() == "true"
+
+timeout = int(os.environ.get("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+max_requests = int(os.environ.get("MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def _unversioned_schema() -> bool:
+    from sqlalchemy import inspect
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.core.config import settings
+
+    async def check():
+        engine = create_async_engine(settings.DATABASE_URL)
+        try:
+            async with engine.connect() as connection:
+                tables = await connection.run_sync(lambda conn: set(inspect(conn).get_table_names()))
+        finally:
+            await engine.dispose()
+        return "users" in tables and "alembic_version" not in tables
+
+    return asyncio.run(check())
+
+
+def on_starting(server):
+    if workers > 1:
+        server.log.warning(
+            "Live trip watching uses in-process fan-out: with %d workers a watcher "
+            "only sees drivers connected to the same worker. Run WEB_CONCURRENCY=1 "
+            "for live tracking or give LiveHub a cross-process backend.", workers
+        )
+    if os.environ.get("RUN_MIGRATIONS", "").lower() in ("1", "true"):
+        if _unversioned_schema():
+            server.log.info("Existing schema has no migration history, stamping revision 001")
+            subprocess.run([sys.executable, "-m", "alembic", "stamp", "001"], check=True)
+        server.log.info("Applying database migrations")
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], check=True)
+
+
+def post_fork(server, worker):
+    # Never share pooled connections inherited from the master
+    database = sys.modules.get("app.core.database")
+    if database is not None:
+        database.engine.sync_engine.dispose(close=False)
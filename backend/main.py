@@ -4,18 +4,23 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
 import uvicorn
 from app.core.config import settings
+from app.core.compression import RequestDecompressionMiddleware, ResponseCompressionMiddleware
+from app.core.ratelimit import RateLimitMiddleware
 from app.core.database import engine, Base
-from app.api.v1 import auth, trips, reports, users
-from app.core.dependencies import get_current_user
+from app.api.v1 import auth, trips, reports, users, fleet, live, exports
+from app.services import inference
+from app.core.dependencies import get_current_user, token_verifier
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if settings.AUTO_CREATE_SCHEMA:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     yield
     # Shutdown
+    inference.shutdown()
     await engine.dispose()
 
 
@@ -26,13 +31,39 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS middleware
+# Compression: gzip responses above the size threshold, accept gzip uploads
+app.add_middleware(
+    ResponseCompressionMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+    excluded_paths=("/api/v1/live",),
+)
+app.add_middleware(
+    RequestDecompressionMiddleware,
+    max_body_size=settings.MAX_DECOMPRESSED_BODY_BYTES,
+    paths=("/api/v1/trips/upload",),
+)
+
+# Rate limiting and load shedding, ahead of the app so rejected requests cost little
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rates=settings.RATE_LIMITS,
+        concurrency=settings.CONCURRENCY_LIMITS,
+        default_rate=settings.RATE_LIMIT_DEFAULT,
+        trusted_proxy_hops=settings.RATE_LIMIT_TRUSTED_PROXY_HOPS,
+        verifier=token_verifier,
+    )
+
+# CORS middleware, added last so it wraps everything above: 429, 503, 413 and
+# 415 answers from the other middleware stay readable by browser clients
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 # Include routers
@@ -40,6 +71,9 @@ app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(trips.router, prefix="/api/v1/trips", tags=["Trips"])
 app.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
+app.include_router(fleet.router, prefix="/api/v1/fleet", tags=["Fleet"])
+app.include_router(live.router, prefix="/api/v1/live", tags=["Live"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
 
 
 @app.get("/")
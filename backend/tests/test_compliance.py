@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from app.services.compliance import evaluate, parse_speed_limit
+
+
+def test_parse_speed_limit():
+    assert parse_speed_limit("speed_limit_60") == 60
+    assert np.isnan(parse_speed_limit("stop"))
+    assert np.isnan(parse_speed_limit(None))
+
+
+def test_time_and_distance_over_in_force_limit():
+    # 1 Hz samples: 20 m/s (72 km/h) for 10 s, then 10 m/s (36 km/h)
+    event_ts = np.arange(20, dtype=float)
+    speed = np.where(event_ts < 10, 20.0, 10.0)
+
+    result = evaluate(
+        event_ts=event_ts,
+        speed_m_s=speed,
+        sign_ts=np.array([2.0, 5.0, 15.0]),
+        sign_classes=["speed_limit_60", "stop", "speed_limit_30"],
+        sign_confidence=np.array([0.9, 0.9, 0.9]),
+        min_confidence=0.5,
+    )
+
+    # 60 applies from t=2, 30 from t=15; no limit known for t<2
+    assert result["samples_with_limit"] == 18
+    assert result["time_over_limit_s"] == pytest.approx(8 + 4)
+    assert result["distance_over_limit_m"] == pytest.approx(8 * 20 + 4 * 10)
+    assert result["max_excess_kmh"] == pytest.approx(12.0)
+    assert result["by_limit"]["30"]["time_over_s"] == pytest.approx(4)
+
+
+def test_low_confidence_signs_are_ignored():
+    result = evaluate(
+        event_ts=np.arange(5, dtype=float),
+        speed_m_s=np.full(5, 30.0),
+        sign_ts=np.array([0.0]),
+        sign_classes=["speed_limit_50"],
+        sign_confidence=np.array([0.2]),
+        min_confidence=0.5,
+    )
+
+    assert result["samples_with_limit"] == 0
+    assert result["time_over_limit_s"] == 0
@@ -0,0 +1,51 @@
+import gzip
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+from app.core.compression import RequestDecompressionMiddleware
+
+
+def _make_app(max_body_size: int = 1024):
+    app = FastAPI()
+    app.add_middleware(RequestDecompressionMiddleware, max_body_size=max_body_size)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {"length": len(body), "encoding": request.headers.get("content-encoding")}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_gzip_request_body_is_inflated():
+    async with AsyncClient(app=_make_app(), base_url="http://test") as client:
+        response = await client.post(
+            "/echo",
+            content=gzip.compress(b"x" * 500),
+            headers={"Content-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"length": 500, "encoding": None}
+
+
+@pytest.mark.asyncio
+async def test_decompression_bomb_is_rejected():
+    async with AsyncClient(app=_make_app(max_body_size=1024), base_url="http://test") as client:
+        response = await client.post(
+            "/echo",
+            content=gzip.compress(b"\0" * 10_000_000),
+            headers={"Content-Encoding": "gzip"}
+        )
+        assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_unsupported_encoding_is_rejected():
+    async with AsyncClient(app=_make_app(), base_url="http://test") as client:
+        response = await client.post(
+            "/echo",
+            content=b"data",
+            headers={"Content-Encoding": "compress"}
+        )
+        assert response.status_code == 415
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+import pytest
+from app.services import export
+from app.services.export import ExportJobStore, _parse
+
+
+def test_job_store_round_trip(tmp_path):
+    store = ExportJobStore(str(tmp_path / "exports"))
+
+    job = store.create(7, {"kind": "events", "format": "csv", "event_types": ["hard_brake"]})
+    job["status"] = "completed"
+    store.save(job)
+
+    loaded = store.load(job["id"])
+    assert loaded["user_id"] == 7
+    assert loaded["status"] == "completed"
+    assert store.output_path(loaded).endswith(f"{job['id']}.csv")
+    assert store.load("0" * 32) is None
+
+
+def test_parse_accepts_utc_suffix():
+    assert _parse("2024-05-01T08:00:00Z") == datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def test_create_purges_expired_files(tmp_path):
+    store = ExportJobStore(str(tmp_path), retention_seconds=3600)
+    old = store.create(7, {"kind": "events", "format": "csv"})
+    output = tmp_path / f"{old['id']}.csv"
+    output.write_text("id\n")
+    for path in (output, tmp_path / f"{old['id']}.json"):
+        os.utime(path, (time.time() - 7200,) * 2)
+
+    new = store.create(7, {"kind": "events", "format": "csv"})
+
+    assert store.load(old["id"]) is None
+    assert not output.exists()
+    assert store.load(new["id"]) is not None
+
+
+def test_load_fails_unfinished_jobs_without_heartbeat(tmp_path):
+    store = ExportJobStore(str(tmp_path), stale_seconds=60)
+    stale = store.create(7, {"kind": "events", "format": "csv"})
+    stale["status"] = "running"
+    store.save(stale)
+    os.utime(tmp_path / f"{stale['id']}.json", (time.time() - 120,) * 2)
+    fresh = store.create(7, {"kind": "events", "format": "csv"})
+
+    loaded = store.load(stale["id"])
+
+    assert loaded["status"] == "failed"
+    assert loaded["error"] == "Export was interrupted"
+    assert loaded["finished_at"] is not None
+    assert store.load(stale["id"])["status"] == "failed"
+    assert store.load(fresh["id"])["status"] == "pending"
+
+
+class _Session:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_run_heartbeat_keeps_long_jobs_alive(tmp_path, monkeypatch):
+    store = ExportJobStore(str(tmp_path), stale_seconds=0.3)
+    job = store.create(7, {"kind": "events", "format": "csv"})
+    seen = []
+
+    async def slow_write(db, kind, fmt, query, path, batch_size):
+        await asyncio.sleep(0.6)
+        seen.append(store.load(job["id"])["status"])
+        return 3
+
+    monkeypatch.setattr(export, "write_file", slow_write)
+    await store.run(job, _Session, batch_size=100)
+
+    assert seen == ["running"]
+    assert store.load(job["id"])["status"] == "completed"
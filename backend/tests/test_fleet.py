@@ -0,0 +1,48 @@
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.trip import LiveTripClose, TripCreate
+from main import app
+
+
+@pytest.fixture
+def signed_in():
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="driver@example.com")
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/fleet/leaderboard", "/api/v1/fleet/cohort"])
+async def test_fleet_requires_operator(signed_in, monkeypatch, path):
+    monkeypatch.setattr(settings, "OPERATOR_EMAILS", ["ops@example.com"])
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get(path)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("field, value", [
+    ("distance_m", -5),
+    ("distance_m", float("nan")),
+    ("unsafe_events", -1),
+    ("max_speed_m_s", float("inf")),
+])
+def test_trip_summary_rejects_negative_and_non_finite(field, value):
+    trip = {
+        "start_time": "2024-05-01T08:00:00Z",
+        "end_time": "2024-05-01T08:10:00Z",
+        "duration_seconds": 600,
+        "distance_m": 5000.0,
+        "avg_speed_m_s": 8.0,
+        "max_speed_m_s": 20.0,
+        "unsafe_events": 1,
+    }
+    with pytest.raises(ValidationError):
+        TripCreate.model_validate(dict(trip, **{field: value}))
+    with pytest.raises(ValidationError):
+        LiveTripClose.model_validate({field: value})
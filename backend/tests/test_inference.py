@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys
+import main
+heavy = [name for name in ("tensorflow", "PIL", "keras") if name in sys.modules]
+print(",".join(heavy))
+"""
+
+
+def test_importing_the_app_leaves_the_ml_stack_unloaded(tmp_path):
+    # Empty stand-ins make an eager import visible even where TensorFlow isn't installed
+    for name in ("tensorflow", "PIL"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "__init__.py").write_text("")
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [str(tmp_path), os.environ.get("PYTHONPATH")])),
+        DATABASE_URL=os.environ.get("DATABASE_URL", "postgresql+asyncpg://u:p@localhost/x"),
+        JWT_SECRET_KEY=os.environ.get("JWT_SECRET_KEY", "x"),
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from starlette.websockets import WebSocketDisconnect
+from app.api.v1 import live
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.services.live import LiveTripSession
+from main import app
+
+DRIVER = User(id=1, email="driver@example.com")
+
+
+@pytest.mark.asyncio
+async def test_events_stream_of_another_driver_is_forbidden():
+    app.dependency_overrides[get_current_user] = lambda: DRIVER
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/v1/live/drivers/2/events")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 403
+
+
+def test_websocket_of_another_driver_is_closed(monkeypatch):
+    async def websocket_user(websocket):
+        return DRIVER
+
+    monkeypatch.setattr(live, "_websocket_user", websocket_user)
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with TestClient(app).websocket_connect("/api/v1/live/drivers/2"):
+            pass
+
+    assert closed.value.code == 1008
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_the_batch():
+    class FailingSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, *args):
+            raise ConnectionError("database unavailable")
+
+    session = LiveTripSession(FailingSession, 1, 1, None, batch_size=100, flush_interval=60)
+    session._events = [{"trip_id": 1}, {"trip_id": 1}]
+
+    with pytest.raises(ConnectionError):
+        await session.flush()
+
+    assert len(session._events) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("frame, expected", [
+    ({"type": "websocket.receive", "bytes": b"\x81"}, None),
+    ({"type": "websocket.receive", "text": "[1, 2]"}, None),
+    ({"type": "websocket.receive", "text": "not json"}, None),
+    ({"type": "websocket.receive", "text": '{"type": "end"}'}, {"type": "end"}),
+])
+async def test_only_json_object_frames_are_accepted(frame, expected):
+    class FakeWebSocket:
+        async def receive(self):
+            return frame
+
+    assert await live._receive_json_object(FakeWebSocket()) == expected
+
+
+@pytest.mark.asyncio
+async def test_disconnect_frame_raises():
+    class FakeWebSocket:
+        async def receive(self):
+            return {"type": "websocket.disconnect", "code": 1001}
+
+    with pytest.raises(WebSocketDisconnect):
+        await live._receive_json_object(FakeWebSocket())
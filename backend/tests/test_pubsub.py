@@ -0,0 +1,57 @@
+import pytest
+from app.services.pubsub import LiveBackend, LiveHub
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_subscribers_of_channel_only():
+    hub = LiveHub(queue_size=4)
+
+    with hub.subscribe(1) as first, hub.subscribe(2) as second:
+        hub.publish(1, {"n": 1})
+
+        assert await first.get() == {"n": 1}
+        assert second.queue.empty()
+
+    assert hub.subscriber_count(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_messages():
+    hub = LiveHub(queue_size=2)
+
+    with hub.subscribe(1) as subscription:
+        for n in range(5):
+            hub.publish(1, n)
+
+        assert subscription.take_dropped() == 3
+        assert [await subscription.get(), await subscription.get()] == [3, 4]
+        assert subscription.take_dropped() == 0
+
+
+@pytest.mark.asyncio
+async def test_messages_go_through_the_backend():
+    class RecordingBackend(LiveBackend):
+        def __init__(self):
+            self.published = []
+            self.channels = []
+
+        def publish(self, channel, message):
+            self.published.append((channel, message))
+            self.deliver(channel, message)
+
+        def subscribed(self, channel):
+            self.channels.append(channel)
+
+        def unsubscribed(self, channel):
+            self.channels.remove(channel)
+
+    backend = RecordingBackend()
+    hub = LiveHub(backend=backend)
+
+    with hub.subscribe(1) as subscription, hub.subscribe(1):
+        assert backend.channels == [1]
+        hub.publish(1, "x")
+        assert await subscription.get() == "x"
+
+    assert backend.published == [(1, "x")]
+    assert backend.channels == []
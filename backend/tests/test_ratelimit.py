@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from app.core.ratelimit import InMemoryRateLimitBackend, RateLimitBackend, RateLimitMiddleware, parse_rate
+from app.core.tokens import TokenVerifier
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == (10, 10 / 60)
+    assert parse_rate("5/seconds") == (5, 5.0)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills():
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+
+    assert await backend.consume("k", 2, 1.0) == 0
+    assert await backend.consume("k", 2, 1.0) == 0
+    assert await backend.consume("k", 2, 1.0) == pytest.approx(1.0)
+
+    clock.now = 1.0
+    assert await backend.consume("k", 2, 1.0) == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_429_with_retry_after():
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        rates={"/api/v1/auth": "2/minute"},
+        concurrency={},
+        verifier=TokenVerifier("secret", "HS256"),
+    )
+
+    @app.post("/api/v1/auth/login")
+    async def login():
+        return {}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        statuses = [(await client.post("/api/v1/auth/login")).status_code for _ in range(3)]
+        response = await client.post("/api/v1/auth/login")
+
+    assert statuses == [200, 200, 429]
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_client_ip_comes_from_trusted_proxy_hop():
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware,
+        rates={"/api/v1/auth": "1/minute"},
+        concurrency={},
+        verifier=TokenVerifier("secret", "HS256"),
+        trusted_proxy_hops=1,
+    )
+
+    @app.post("/api/v1/auth/login")
+    async def login():
+        return {}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = await client.post("/api/v1/auth/login", headers={"X-Forwarded-For": "10.0.0.1"})
+        other = await client.post("/api/v1/auth/login", headers={"X-Forwarded-For": "10.0.0.2"})
+        # A spoofed leftmost entry doesn't get a fresh bucket
+        spoofed = await client.post("/api/v1/auth/login", headers={"X-Forwarded-For": "1.2.3.4, 10.0.0.1"})
+
+    assert [first.status_code, other.status_code, spoofed.status_code] == [200, 200, 429]
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_cors_wraps_rate_limiter():
+    from fastapi.middleware.cors import CORSMiddleware
+    from main import app
+
+    # user_middleware is ordered outermost first
+    assert app.user_middleware[0].cls is CORSMiddleware
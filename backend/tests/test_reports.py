@@ -0,0 +1,224 @@
+import json
+import math
+from datetime import datetime, timedelta, timezone
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from app.api.v1.reports import _format_events, _format_signs, _isoformat, _json_column
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.models.trip import Trip
+from app.models.user import User
+from main import app
+
+START = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _legacy_event(event_type, timestamp, lat, lon, speed, accel):
+    """The per-row shape the report used to build from ORM objects."""
+    return {
+        "type": event_type,
+        "timestamp": timestamp.isoformat() if timestamp else None,
+        "location": {"lat": lat, "lon": lon},
+        "speed_kmh": round(speed * 3.6, 2) if speed else 0,
+        "acceleration": round(accel, 2) if accel else 0
+    }
+
+
+def _legacy_sign(ts, class_name, confidence, bbox):
+    return {
+        "timestamp": ts.isoformat() if ts else None,
+        "class": class_name,
+        "confidence": round(confidence, 3) if confidence else 0,
+        "bbox": bbox
+    }
+
+
+def _epoch(timestamp):
+    return timestamp.timestamp() if timestamp else None
+
+
+def _join(formatter, chunks):
+    return json.loads("[" + ", ".join(formatter(chunk) for chunk in chunks) + "]")
+
+
+def test_isoformat_matches_datetime_isoformat():
+    timestamps = [START, START + timedelta(microseconds=250), START + timedelta(seconds=1.5)]
+
+    assert _isoformat([_epoch(t) for t in timestamps]) == [t.isoformat() for t in timestamps]
+    assert _isoformat([None, float("nan")]) == [None, None]
+
+
+def test_json_column_encodes_numbers_nulls_and_strings():
+    values = [1.5, None, 0, "2024-05-01T08:00:00+00:00"]
+
+    assert json.loads("[" + ", ".join(_json_column(values)) + "]") == values
+
+
+def test_format_events_matches_legacy_shape_across_chunks():
+    events = [
+        ("hard_brake", START, 52.1, 4.3, 12.5, -4.123),
+        ("overspeed", START + timedelta(seconds=1, microseconds=500), 52.2, 4.4, 30.0, 0.0),
+        ("unsafe_curve", None, None, None, None, None),
+        ("harsh_accel", START + timedelta(seconds=3), 52.3, None, 0.0, 3.456),
+        ('quote"type', START + timedelta(seconds=4), 52.4, 4.6, 8.333, 1.0),
+    ]
+    rows = [(t, _epoch(ts), lat, lon, speed, accel) for t, ts, lat, lon, speed, accel in events]
+
+    parsed = _join(_format_events, [rows[:2], rows[2:3], rows[3:]])
+
+    assert parsed == [_legacy_event(*event) for event in events]
+
+
+def test_format_events_zeroes_nan_speed_and_acceleration():
+    rows = [("overspeed", _epoch(START), 52.1, 4.3, float("nan"), float("nan"))]
+
+    parsed = _join(_format_events, [rows])
+
+    assert parsed[0]["speed_kmh"] == 0.0
+    assert parsed[0]["acceleration"] == 0.0
+
+
+def test_format_signs_matches_legacy_shape_across_chunks():
+    signs = [
+        (START, "speed_limit_60", 0.91234, {"x": 10, "y": 20, "w": 30, "h": 30}, 12),
+        (None, "stop", None, None, 1),
+        (START + timedelta(seconds=7, microseconds=10), "yield", 0.5, [1, 2, 3, 4], 3),
+    ]
+    rows = [(_epoch(ts), name, conf, bbox, count) for ts, name, conf, bbox, count in signs]
+
+    parsed = _join(_format_signs, [rows[:1], rows[1:]])
+
+    assert [{k: v for k, v in item.items() if k != "count"} for item in parsed] == [
+        _legacy_sign(ts, name, conf, bbox) for ts, name, conf, bbox, _ in signs
+    ]
+    assert [item["count"] for item in parsed] == [12, 1, 3]
+
+
+def test_format_signs_zeroes_nan_confidence():
+    parsed = _join(_format_signs, [[(_epoch(START), "stop", float("nan"), None, 1)]])
+
+    assert parsed[0]["confidence"] == 0.0
+    assert not math.isnan(parsed[0]["confidence"])
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class _Stream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def partitions(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class FakeSession:
+    """Answers the report's three lookups, then streams the given chunks."""
+
+    def __init__(self, trip, breakdown, sign_total, event_chunks, sign_chunks):
+        self.results = [_Result(trip), _Result(list(breakdown.items())), _Result(sign_total)]
+        self.chunks = [event_chunks, sign_chunks]
+        self.streamed = []
+
+    async def execute(self, query):
+        return self.results.pop(0)
+
+    async def stream(self, query):
+        self.streamed.append(query)
+        return _Stream(self.chunks[len(self.streamed) - 1])
+
+
+def _sql(query):
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def trip():
+    return Trip(
+        id=7, user_id=1, start_time=START, end_time=START + timedelta(minutes=10),
+        duration_seconds=600, distance_m=5000.0, avg_speed_m_s=8.0, max_speed_m_s=20.0,
+        unsafe_events=3
+    )
+
+
+@pytest.fixture
+def report_session(trip):
+    events = [
+        ("hard_brake", _epoch(START), 52.1, 4.3, 12.5, -4.1),
+        ("hard_brake", None, None, None, None, None),
+        ("overspeed", _epoch(START + timedelta(seconds=2)), 52.2, 4.4, float("nan"), 0.5),
+    ]
+    signs = [(_epoch(START), "speed_limit_60", 0.9, {"x": 1, "y": 2, "w": 3, "h": 4}, 5)]
+    session = FakeSession(trip, {"hard_brake": 2, "overspeed": 1}, 1, [events[:2], events[2:]], [signs])
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="driver@example.com")
+    app.dependency_overrides[get_db] = lambda: session
+    yield session
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_report_streams_valid_json(report_session):
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/reports/7")
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["trip_id"] == 7
+    assert report["summary"]["start_time"] == START.isoformat()
+    assert report["summary"]["distance_km"] == 5.0
+    assert [event["type"] for event in report["events"]] == ["hard_brake", "hard_brake", "overspeed"]
+    assert report["events"][1]["timestamp"] is None
+    assert report["events"][2]["speed_kmh"] == 0.0
+    assert report["sign_detections"][0]["count"] == 5
+    assert report["analytics"]["event_breakdown"] == {"hard_brake": 2, "overspeed": 1}
+    assert report["pagination"] == {
+        "event_offset": 0, "event_limit": None, "events_total": 3, "sign_detections_total": 1
+    }
+    assert _sql(report_session.streamed[0]).endswith("LIMIT ALL OFFSET 0")
+
+
+@pytest.mark.asyncio
+async def test_report_applies_event_offset_and_limit(report_session):
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/reports/7", params={"event_offset": 100, "event_limit": 50})
+
+    assert response.status_code == 200
+    assert response.json()["pagination"]["event_offset"] == 100
+    assert response.json()["pagination"]["event_limit"] == 50
+    events_sql = _sql(report_session.streamed[0])
+    assert "LIMIT 50 OFFSET 100" in events_sql
+    assert "LIMIT" not in _sql(report_session.streamed[1])
+
+
+@pytest.mark.asyncio
+async def test_report_summary_only_skips_rows(report_session):
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/reports/7", params={"summary_only": True})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert set(report) == {"trip_id", "summary", "analytics", "pagination"}
+    assert report["pagination"]["events_total"] == 3
+    assert report_session.streamed == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [{"event_offset": -1}, {"event_limit": 0}])
+async def test_report_rejects_bad_pagination(report_session, params):
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/reports/7", params=params)
+
+    assert response.status_code == 422
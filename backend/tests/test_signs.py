@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from app.services.signs import bbox_array, cluster_detections, pairwise_iou
+
+T0 = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _sign(seconds, class_name="speed_limit_60", confidence=0.8, bbox=None):
+    return {
+        "ts": T0 + timedelta(seconds=seconds),
+        "class_name": class_name,
+        "confidence": confidence,
+        "bbox": {"x1": 100, "y1": 100, "x2": 140, "y2": 140} if bbox is None else bbox,
+    }
+
+
+def test_bbox_formats():
+    boxes = bbox_array([
+        {"x1": 1, "y1": 2, "x2": 3, "y2": 4},
+        {"x": 1, "y": 2, "w": 2, "h": 2},
+        {"x": 1, "y": 2, "width": 2, "height": 2},
+        {"label": "?"},
+        None,
+    ])
+    np.testing.assert_array_equal(boxes[:3], [[1, 2, 3, 4]] * 3)
+    assert np.isnan(boxes[3:]).all()
+
+
+def test_pairwise_iou():
+    a = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [0, 0, 10, 10]], dtype=float)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [np.nan] * 4])
+    iou = pairwise_iou(a, b)
+    assert iou[0] == 1.0
+    assert iou[1] == 50 / 150
+    assert np.isnan(iou[2])
+
+
+def test_repeated_frames_merge_into_one_row():
+    frames = [_sign(i * 0.1, confidence=c) for i, c in enumerate([0.6, 0.9, 0.7])]
+    frames[1]["bbox"] = {"x1": 102, "y1": 101, "x2": 142, "y2": 141}
+
+    [cluster] = cluster_detections(frames, window_s=1.0, min_iou=0.3)
+
+    assert cluster["detection_count"] == 3
+    assert cluster["ts"] == frames[0]["ts"]
+    assert cluster["last_ts"] == frames[2]["ts"]
+    assert cluster["confidence"] == 0.9
+    assert abs(cluster["mean_confidence"] - 0.7333) < 1e-3
+    assert cluster["bbox"] == frames[1]["bbox"]
+    assert sorted(cluster["members"]) == [0, 1, 2]
+
+
+def test_class_gap_and_overlap_split_clusters():
+    frames = [
+        _sign(0.0),
+        _sign(0.1, class_name="stop"),
+        _sign(0.2),
+        _sign(5.0),
+        _sign(5.1, bbox={"x1": 400, "y1": 100, "x2": 440, "y2": 140}),
+    ]
+
+    clusters = cluster_detections(frames, window_s=1.0, min_iou=0.3)
+
+    assert [(c["class_name"], c["detection_count"]) for c in clusters] == [
+        ("speed_limit_60", 2), ("stop", 1), ("speed_limit_60", 1), ("speed_limit_60", 1),
+    ]
+
+
+def test_unreadable_boxes_cluster_on_time():
+    frames = [_sign(i * 0.2, bbox={}) for i in range(4)]
+    assert [c["detection_count"] for c in cluster_detections(frames, 1.0, 0.3)] == [4]
+    assert cluster_detections([], 1.0, 0.3) == []
+
+
+def test_interleaved_signs_keep_separate_tracks():
+    left = {"x1": 100, "y1": 100, "x2": 140, "y2": 140}
+    right = {"x1": 400, "y1": 100, "x2": 440, "y2": 140}
+    frames = []
+    for i in range(10):
+        frames.append(_sign(i * 0.1, bbox=dict(left, x1=100 + i, x2=140 + i)))
+        frames.append(_sign(i * 0.1, bbox=dict(right, x1=400 - i, x2=440 - i)))
+
+    clusters = cluster_detections(frames, window_s=1.0, min_iou=0.3)
+
+    assert [c["detection_count"] for c in clusters] == [10, 10]
+    assert sorted(clusters[0]["members"]) == list(range(0, 20, 2))
+    assert sorted(clusters[1]["members"]) == list(range(1, 20, 2))
+    assert clusters[0]["last_ts"] == frames[-1]["ts"]
+
+
+def test_track_survives_a_missed_frame_between_other_signs():
+    frames = [
+        _sign(0.0),
+        _sign(0.1, bbox={"x1": 400, "y1": 100, "x2": 440, "y2": 140}),
+        _sign(0.2, bbox={"x1": 401, "y1": 100, "x2": 441, "y2": 140}),
+        _sign(0.3),
+    ]
+
+    clusters = cluster_detections(frames, window_s=1.0, min_iou=0.3)
+
+    assert [sorted(c["members"]) for c in clusters] == [[0, 3], [1, 2]]
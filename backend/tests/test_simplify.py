@@ -0,0 +1,52 @@
+import numpy as np
+from app.services.simplify import douglas_peucker_tolerances, keep_mask, route_tolerances
+
+
+def _reference_dp(points, epsilon):
+    def recurse(first, last):
+        if last - first < 2:
+            return []
+        a, b = points[first], points[last]
+        ab = b - a
+        best, index = -1.0, None
+        for i in range(first + 1, last):
+            t = np.clip(np.dot(points[i] - a, ab) / np.dot(ab, ab), 0, 1)
+            d = np.linalg.norm(points[i] - (a + t * ab))
+            if d > best:
+                best, index = d, i
+        if best <= epsilon:
+            return []
+        return recurse(first, index) + [index] + recurse(index, last)
+
+    return sorted([0, len(points) - 1] + recurse(0, len(points) - 1))
+
+
+def test_tolerances_reproduce_douglas_peucker_at_every_level():
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.normal(size=(300, 2)) * 10, axis=0)
+
+    tolerances = douglas_peucker_tolerances(points)
+
+    for epsilon in (1.0, 5.0, 25.0, 100.0):
+        kept = np.flatnonzero(keep_mask(tolerances, epsilon)).tolist()
+        assert kept == _reference_dp(points, epsilon)
+
+
+def test_straight_line_keeps_endpoints_only():
+    lat = np.linspace(40.0, 40.01, 50)
+    lon = np.full(50, -74.0)
+
+    tolerances = route_tolerances(np.arange(50.0), lat, lon)
+
+    assert np.isinf(tolerances[[0, -1]]).all()
+    assert keep_mask(tolerances, 1.0).sum() == 2
+    assert keep_mask(tolerances, 0.0).all()
+
+
+def test_points_without_coordinates_are_kept():
+    lat = np.array([40.0, np.nan, 40.001, 40.002, 40.003])
+    lon = np.full(5, -74.0)
+
+    tolerances = route_tolerances(np.arange(5.0), lat, lon)
+
+    assert np.isinf(tolerances[1])
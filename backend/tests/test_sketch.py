@@ -0,0 +1,34 @@
+import pytest
+from app.services.sketch import QuantileSketch
+
+
+def test_quantiles_within_relative_accuracy():
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    sketch.update(range(1, 1001))
+
+    assert sketch.count == 1000
+    assert sketch.quantile(0.5) == pytest.approx(500, rel=0.02)
+    assert sketch.quantile(0.99) == pytest.approx(990, rel=0.02)
+
+
+def test_merge_matches_single_sketch():
+    left, right, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    left.update([0, 1, 2, 3])
+    right.update([10, 20, 30])
+    both.update([0, 1, 2, 3, 10, 20, 30])
+
+    left.merge(right)
+
+    assert left.to_dict() == both.to_dict()
+    assert left.quantile(0.0) == 0.0
+
+
+def test_serialisation_round_trip():
+    sketch = QuantileSketch()
+    sketch.update([0.5, 4.0, 4.0, 12.5])
+
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert restored.count == 4
+    assert restored.quantile(0.5) == sketch.quantile(0.5)
+    assert QuantileSketch.from_dict(None).quantile(0.5) is None
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+from app.core.tokens import RevocationList, TokenVerifier
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _token(sub="1", **claims):
+    exp = datetime.now(timezone.utc) + timedelta(hours=1)
+    return jwt.encode({"sub": sub, "exp": exp, **claims}, "secret", algorithm="HS256")
+
+
+def test_verifier_caches_and_rejects_bad_tokens():
+    verifier = TokenVerifier("secret", "HS256")
+    token = _token(jti="a")
+
+    assert verifier.verify(token)["sub"] == "1"
+    assert verifier.verify(token) is verifier.verify(token)
+    assert verifier.verify(token + "x") is None
+    assert verifier.verify(jwt.encode({"sub": "1"}, "other", algorithm="HS256")) is None
+
+
+def test_verifier_entries_expire_and_are_bounded():
+    clock = FakeClock()
+    verifier = TokenVerifier("secret", "HS256", max_entries=2, ttl_seconds=10, clock=clock)
+    tokens = [_token(sub=str(i)) for i in range(3)]
+
+    first = verifier.verify(tokens[0])
+    clock.now += 11
+    assert verifier.verify(tokens[0]) is not first
+
+    for token in tokens:
+        verifier.verify(token)
+    assert len(verifier._cache) == 2
+
+    verifier.forget(tokens[2])
+    assert len(verifier._cache) == 1
+
+
+def test_revocation_list_merges_and_prunes():
+    clock = FakeClock()
+    revocations = RevocationList(sync_interval=30, clock=clock)
+    now = datetime.now(timezone.utc)
+
+    assert revocations.sync_due()
+    assert not revocations.sync_due()
+    revocations.merge([
+        (1, "live", now + timedelta(hours=1)),
+        (4, "expired", now - timedelta(hours=1)),
+    ], max_id=5)
+
+    assert revocations.is_revoked("live")
+    assert not revocations.is_revoked("expired")
+    assert revocations.last_id == 5
+    # Ids below the max that weren't returned may still be uncommitted
+    assert revocations.pending_ids == [2, 3, 5]
+
+    clock.now += 31
+    assert revocations.sync_due()
+
+
+def test_revocation_list_requeries_ids_committed_late():
+    clock = FakeClock()
+    revocations = RevocationList(gap_timeout=300, clock=clock)
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+    revocations.merge([(1, "a", later)], max_id=1)
+
+    revocations.merge([(3, "c", later)])
+    assert revocations.pending_ids == [2]
+
+    revocations.merge([(2, "b", later)])
+    assert revocations.is_revoked("b")
+    assert revocations.pending_ids == []
+    assert revocations.last_id == 3
+
+    revocations.merge([(6, "f", later)])
+    clock.now += 301
+    revocations.merge([])
+    assert revocations.pending_ids == []
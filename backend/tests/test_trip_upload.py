@@ -0,0 +1,28 @@
+import pytest
+from httpx import AsyncClient
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.services import wire
+from main import app
+
+
+def test_upload_documents_both_encodings():
+    body = app.openapi()["paths"]["/api/v1/trips/upload"]["post"]["requestBody"]
+
+    json_schema = body["content"]["application/json"]["schema"]
+    assert "start_time" in json_schema["properties"]
+    assert "$ref" not in str(json_schema)
+    assert wire.MEDIA_TYPE in body["content"]
+
+
+@pytest.mark.asyncio
+async def test_validation_errors_are_located_in_body():
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="driver@example.com")
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post("/api/v1/trips/upload", json={"distance_m": 1.0})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 422
+    assert ["body", "start_time"] in [error["loc"] for error in response.json()["detail"]]
@@ -0,0 +1,81 @@
+import msgpack
+import numpy as np
+import pytest
+from datetime import datetime, timezone
+from app.services import wire
+
+
+def _trip():
+    start = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    return {
+        "start_time": start,
+        "end_time": start,
+        "duration_seconds": 60,
+        "distance_m": 800.0,
+        "avg_speed_m_s": 13.3,
+        "max_speed_m_s": 20.0,
+        "unsafe_events": 2,
+    }
+
+
+def test_round_trip():
+    events = {
+        "event_type": ["hard_brake", "overspeed", "hard_brake"],
+        "timestamp": np.array([1714550400.0, 1714550401.5, 1714550403.0]),
+        "lat": np.array([40.1, 40.2, 40.3]),
+        "lon": np.array([-74.1, -74.2, -74.3]),
+        "speed_m_s": np.array([10.0, 25.0, 5.0]),
+        "accel_m_s2": np.array([-5.0, 0.5, -6.0]),
+    }
+    body = wire.encode_trip(_trip(), events, [])
+
+    packed = wire.decode_trip(body)
+
+    assert packed.fields["duration_seconds"] == 60
+    assert packed.fields["start_time"] == _trip()["start_time"]
+    assert len(packed.events) == 3
+    assert packed.events.event_type.tolist() == events["event_type"]
+    np.testing.assert_allclose(packed.events.columns["lat"], events["lat"])
+
+    rows = packed.events.rows(trip_id=7)
+    assert rows[1]["trip_id"] == 7
+    assert rows[1]["event_type"] == "overspeed"
+    assert rows[1]["timestamp"] == datetime(2024, 5, 1, 8, 0, 1, 500000, tzinfo=timezone.utc)
+
+
+def test_mismatched_columns_are_rejected():
+    payload = {key: value.timestamp() if isinstance(value, datetime) else value
+               for key, value in _trip().items()}
+    payload["events"] = {
+        "event_types": ["hard_brake"],
+        "type_code": np.zeros(2, dtype="<u1").tobytes(),
+        "timestamp": np.zeros(3, dtype="<f8").tobytes(),
+    }
+
+    with pytest.raises(wire.WireFormatError):
+        wire.decode_trip(msgpack.packb(payload, use_bin_type=True))
+
+
+@pytest.mark.parametrize("override", [
+    {"duration_seconds": "x"},
+    {"distance_m": [1]},
+    {"avg_speed_m_s": None},
+    {"events": [1, 2]},
+    {"events": {"event_types": [1]}},
+    {"sign_detections": ["stop"]},
+])
+def test_malformed_fields_are_rejected(override):
+    payload = {key: value.timestamp() if isinstance(value, datetime) else value
+               for key, value in _trip().items()}
+    payload.update(override)
+
+    with pytest.raises(wire.WireFormatError):
+        wire.decode_trip(msgpack.packb(payload, use_bin_type=True))
+
+
+def test_to_epoch_reads_naive_datetimes_as_utc():
+    aware = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    epochs = wire.to_epoch([aware, aware.replace(tzinfo=None), None])
+
+    assert epochs[0] == epochs[1] == aware.timestamp()
+    assert np.isnan(epochs[2])